@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.db.session import get_db
 from app.api.v1.auth import get_current_user
 from app.services.calculations import CalculationService
+from app.services.lookup_cache import LookupTableCache
+from app.services.result_cache import CalculationResultCache
+from app.services.lookup_versions import LookupVersionService
 from app.schemas.calculations import CalculationRequest, CalculationResult
 
 from app.models.lookup import LookupTable
@@ -17,26 +20,34 @@ router = APIRouter()
 
 @router.get("/lookup-tables", response_model=List[dict])
 async def get_all_lookup_tables(
+    request: Request,
+    response: Response,
+    since_version: Optional[int] = Query(None, ge=0, description="Only rows changed after this version"),
     db: Session = Depends(get_db),
     # current_user: User = Depends(get_current_user)
 ):
     """
-    Download all lookup tables for offline caching.
+    Download lookup tables for offline caching.
+    Returns an ETag for the current table version and honours If-None-Match (304).
+    Pass since_version (from X-Lookup-Version) to download only changed rows.
     """
-    tables = db.execute(select(LookupTable)).scalars().all()
+    version = LookupVersionService.current_version(db)
+    etag = LookupVersionService.etag(version)
+    headers = {"ETag": etag, "X-Lookup-Version": str(version)}
     
-    # Return a simplified structure or the raw model
-    return [
-        {
-            "id": str(t.id),
-            "table_name": t.table_name,
-            "input_value": t.input_value,
-            "stage_or_condition": t.stage_or_condition,
-            "output_value": t.output_value,
-            "updated_at": t.updated_at
-        }
-        for t in tables
-    ]
+    # Device already holds this version: nothing to send
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return LookupVersionService.get_rows(db, version, since_version)
+
+@router.get("/cache-stats")
+async def get_calculation_cache_stats():
+    """
+    Hit/miss counters and size of the calculation result cache (this worker).
+    """
+    return CalculationResultCache.stats()
 
 @router.post("/stand-reduction", response_model=CalculationResult)
 async def calculate_stand_reduction(
@@ -47,6 +58,12 @@ async def calculate_stand_reduction(
     """
     Perform on-the-fly Stand Reduction calculation.
     """
+    # Identical re-posts are served without DB or calculation work
+    cache_key = CalculationResultCache.make_key("stand_reduction", request)
+    cached = CalculationResultCache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     # Convert Pydantic models to dicts for service
     sample_dicts = [sample.model_dump() for sample in request.samples]
     
@@ -55,8 +72,11 @@ async def calculate_stand_reduction(
             db=db,
             samples=sample_dicts,
             growth_stage=request.growth_stage,
-            normal_plant_population_per_ha=request.normal_plant_population
+            normal_plant_population_per_ha=request.normal_plant_population,
+            interpolate_stages=request.interpolate_stages,
+            uncertainty=request.uncertainty
         )
+        CalculationResultCache.put(cache_key, result)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -69,6 +89,11 @@ async def calculate_hail_damage(
     """
     Perform on-the-fly Hail Damage calculation (Exhibits 13, 14, 15).
     """
+    cache_key = CalculationResultCache.make_key("hail_damage", request)
+    cached = CalculationResultCache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     sample_dicts = [sample.model_dump(exclude_unset=True) for sample in request.samples]
     
     try:
@@ -76,8 +101,11 @@ async def calculate_hail_damage(
             db=db,
             samples=sample_dicts,
             growth_stage=request.growth_stage,
-            normal_plant_population_per_ha=request.normal_plant_population
+            normal_plant_population_per_ha=request.normal_plant_population,
+            interpolate_stages=request.interpolate_stages,
+            uncertainty=request.uncertainty
         )
+        CalculationResultCache.put(cache_key, result)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -91,6 +119,11 @@ async def calculate_weight_method(
     """
     Perform on-the-fly Weight Method Appraisal (Exhibit 17 + Quality).
     """
+    cache_key = CalculationResultCache.make_key("weight_method", request)
+    cached = CalculationResultCache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     sample_dicts = [sample.model_dump(exclude_unset=True) for sample in request.samples]
     
     try:
@@ -99,7 +132,8 @@ async def calculate_weight_method(
             samples=sample_dicts,
             # Pass fields if relevant or default
             moisture_pct=request.moisture_pct,
-            test_weight_kg_hl=request.test_weight_kg_hl
+            test_weight_kg_hl=request.test_weight_kg_hl,
+            uncertainty=request.uncertainty
         )
         
         # Mapping Metric Result
@@ -107,6 +141,7 @@ async def calculate_weight_method(
         result["loss_percentage"] = 0.0 
         result["growth_stage"] = "Mature"
         
+        CalculationResultCache.put(cache_key, result)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -119,6 +154,11 @@ async def calculate_maturity_line_weight(
     """
     Perform on-the-fly Maturity Line Weight calculation (R3-R5).
     """
+    cache_key = CalculationResultCache.make_key("maturity_line_weight", request)
+    cached = CalculationResultCache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     sample_dicts = [sample.model_dump(exclude_unset=True) for sample in request.samples]
     
     try:
@@ -133,6 +173,7 @@ async def calculate_maturity_line_weight(
         result["average_potential_yield_pct"] = result["projected_yield_bu_acre"]
         result["loss_percentage"] = 0.0 # Yield projection
         
+        CalculationResultCache.put(cache_key, result)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -145,6 +186,11 @@ async def calculate_tonnage_method(
     """
     Perform on-the-fly Tonnage Method calculation (Silage).
     """
+    cache_key = CalculationResultCache.make_key("tonnage", request)
+    cached = CalculationResultCache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     sample_dicts = [sample.model_dump(exclude_unset=True) for sample in request.samples]
     
     try:
@@ -180,6 +226,7 @@ async def calculate_tonnage_method(
         result["average_potential_yield_pct"] = result["tonnes_per_ha"] 
         result["growth_stage"] = request.growth_stage
         
+        CalculationResultCache.put(cache_key, result)
         return result
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -229,11 +276,11 @@ async def seed_lookup_tables(
     # current_user: User = Depends(get_current_user)
 ):
     """
-    Initialize USDA lookup tables (Exhibit 11, etc.)
+    Initialize USDA lookup tables (Exhibits 11-24).
+    Tables are seeded at startup; this re-runs the registry on demand.
     """
-    await CalculationService.seed_lookup_tables(db)
-    await CalculationService.seed_lookup_tables(db)
-    return {"message": "Lookup tables seeded successfully"}
+    seeded = await CalculationService.seed_lookup_tables(db)
+    return {"message": "Lookup tables seeded successfully", "seeded_tables": seeded}
 
 class LookupUpdate(BaseModel):
     table_name: str
@@ -267,6 +314,17 @@ async def update_lookup_value(
         raise HTTPException(status_code=404, detail="Lookup entry not found")
         
     entry.output_value = update_data.output_value
+    
+    # New snapshot version so devices pick the change up as a delta
+    version = LookupVersionService.next_version(db)
+    entry.row_version = version
+    LookupVersionService.record_change(
+        db, update_data.table_name, version,
+        f"Admin edit: input {update_data.input_value} {update_data.stage_or_condition or ''}".strip()
+    )
     db.commit()
     
-    return {"message": "Value updated", "new_value": entry.output_value}
+    # Compiled interpolation series are now stale
+    LookupTableCache.invalidate(update_data.table_name)
+    
+    return {"message": "Value updated", "new_value": entry.output_value, "version": version}
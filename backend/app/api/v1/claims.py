@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
@@ -11,10 +11,15 @@ from app.models.tenant import User
 from app.models.claims import Claim, AssessmentSession, AssessmentSample, ClaimStatus, AssessmentStatus
 from app.schemas.claims import (
     ClaimCreate, ClaimUpdate, ClaimResponse,
+    ClaimAssignmentRequest, ClaimAssignmentResponse,
     AssessmentSessionCreate, AssessmentSessionUpdate, AssessmentSessionResponse,
     AssessmentSampleCreate, AssessmentSampleResponse
 )
-from app.models.spatial import Farm, Field
+from app.models.spatial import Farm, Field, SamplingPlan
+from app.services.assignment import AssessorAssignmentService
+from app.services.field_cache import FieldGeometryCache
+from app.services.field_index import FieldIndex
+from app.services.validation import ValidationEngine
 
 router = APIRouter()
 
@@ -118,9 +123,32 @@ async def create_claim(
     
     db.add(db_obj)
     db.commit()
+    
+    if not assigned_assessor_id and claim_data.auto_assign:
+        AssessorAssignmentService.assign(db, current_user.tenant_id, claim_ids=[db_obj.id])
+    
     db.refresh(db_obj)
     return db_obj
 
+@router.post("/assign", response_model=ClaimAssignmentResponse)
+async def assign_claims(
+    request: ClaimAssignmentRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Batch-assign reported, unassigned claims to the nearest available
+    assessors (last device position), respecting per-assessor workload caps.
+    """
+    return AssessorAssignmentService.assign(
+        db,
+        current_user.tenant_id,
+        claim_ids=request.claim_ids,
+        max_open_claims=request.max_open_claims,
+        max_distance_km=request.max_distance_km,
+        candidates_per_claim=request.candidates_per_claim
+    )
+
 @router.get("/", response_model=List[ClaimResponse])
 async def list_claims(
     status_filter: Optional[str] = Query(None),
@@ -237,12 +265,21 @@ async def create_assessment_session(
     
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
+    
+    # An issued sampling plan must belong to the claim's field
+    if session_data.sampling_plan_id:
+        plan = db.execute(
+            select(SamplingPlan).where(SamplingPlan.id == session_data.sampling_plan_id)
+        ).scalar_one_or_none()
+        if not plan or plan.field_id != claim.field_id:
+            raise HTTPException(status_code=400, detail="Sampling plan not found for this claim's field")
         
     session = AssessmentSession(
         claim_id=claim_id,
         assessor_id=current_user.id,
         assessment_method=session_data.assessment_method,
         growth_stage=session_data.growth_stage,
+        sampling_plan_id=session_data.sampling_plan_id,
         weather_conditions=session_data.weather_conditions,
         crop_conditions=session_data.crop_conditions,
         assessor_notes=session_data.assessor_notes,
@@ -280,19 +317,38 @@ async def list_sessions(
         .order_by(desc(AssessmentSession.created_at))
     ).scalars().all()
     
-    # Convert sample geometries to WKT for serialization
-    try:
-        from geoalchemy2.shape import to_shape
-        for session in sessions:
-            for sample in session.samples:
-                if sample.sample_location is not None and not isinstance(sample.sample_location, str):
-                    geom = to_shape(sample.sample_location)
-                    sample.sample_location = geom.wkt
-    except Exception as e:
-        print(f"Warning: Geometry conversion failed in list_sessions: {e}")
-    
+    # Sample locations arrive as WKT (sample_location_wkt) with the selectinload
     return sessions
 
+def _record_gps_validation(db: Session, session: AssessmentSession):
+    """
+    On completion, checks the session's sample positions against the claim's
+    field (prepared boundary from FieldGeometryCache) and stores the flags
+    in calculated_result["gps_validation"].
+    """
+    field = db.execute(
+        select(Field).join(Claim, Claim.field_id == Field.id).where(Claim.id == session.claim_id)
+    ).scalar_one_or_none()
+    if field is None or field.field_boundary is None:
+        return
+    
+    samples = db.execute(
+        select(
+            AssessmentSample.sample_number,
+            func.ST_Y(AssessmentSample.sample_location).label("lat"),
+            func.ST_X(AssessmentSample.sample_location).label("lng")
+        )
+        .where(AssessmentSample.session_id == session.id, AssessmentSample.sample_location.isnot(None))
+    ).mappings().all()
+    
+    flags = ValidationEngine.validate_gps_consistency(
+        [dict(s) for s in samples], prepared_field=FieldGeometryCache.get(field)
+    )
+    session.calculated_result = {
+        **(session.calculated_result or {}),
+        "gps_validation": [flag.model_dump() for flag in flags]
+    }
+
 @router.patch("/{claim_id}/sessions/{session_id}", response_model=AssessmentSessionResponse)
 async def update_session(
     claim_id: UUID,
@@ -319,22 +375,12 @@ async def update_session(
         update_data = session_data.model_dump(exclude_unset=True)
         for k, v in update_data.items():
             setattr(session, k, v)
+        
+        if update_data.get("status") == AssessmentStatus.COMPLETED:
+            _record_gps_validation(db, session)
             
         db.commit()
         db.refresh(session)
-        
-        # FIX: Convert samples geometry to WKT for serialization
-        try:
-            from geoalchemy2.shape import to_shape
-            # Ensure samples are loaded (if not already by relationship)
-            for sample in session.samples:
-                if sample.sample_location is not None:
-                    # Check if it's already a string (WKT) or needs conversion
-                    if not isinstance(sample.sample_location, str):
-                        geom = to_shape(sample.sample_location)
-                        sample.sample_location = geom.wkt
-        except Exception as e:
-            print(f"Warning: Geometry conversion failed: {e}")
 
         # DEBUG: Catch serialization errors
         print(f"DEBUG: Calculated Result: {session.calculated_result}")
@@ -412,14 +458,9 @@ async def add_sample(
     
     db.add(sample)
     db.commit()
+    # The refresh SELECT also renders sample_location_wkt for the response
     db.refresh(sample)
     
-    # Convert geometry to WKT for response serialization
-    from geoalchemy2.shape import to_shape
-    if sample.sample_location:
-        geom = to_shape(sample.sample_location)
-        sample.sample_location = geom.wkt
-    
     return sample
 
 # --- Reporting ---
@@ -472,7 +513,7 @@ async def generate_claim_report(
         for samp in sess.samples:
             s_dict["samples"].append({
                 "sample_number": samp.sample_number,
-                "sample_location": samp.sample_location, # WKT/Geometry
+                "sample_location": samp.sample_location_wkt, # WKT
                 "measurements": samp.measurements,
                 "notes": samp.notes
             })
@@ -499,17 +540,40 @@ async def check_in_at_field(
     Step 5: Assessor Arrival Check-in.
     Verifies if assessor is within field boundaries.
     """
-    claim = db.execute(select(Claim).where(Claim.id == claim_id)).scalar_one_or_none()
+    claim = db.execute(
+        select(Claim).where(Claim.id == claim_id, Claim.tenant_id == current_user.tenant_id)
+    ).scalar_one_or_none()
     if not claim: raise HTTPException(404, "Claim not found")
     
-    # Log Arrival Logic (Mocked for MVP)
-    # In production: Check PostGIS ST_Contains
+    field = db.execute(select(Field).where(Field.id == claim.field_id)).scalar_one_or_none()
+    if not field or field.field_boundary is None:
+        raise HTTPException(400, "Claim field has no boundary")
+    
+    # Point-in-polygon against the cached, prepared boundary
+    prepared_field = FieldGeometryCache.get(field)
+    is_within = prepared_field.contains(latitude, longitude)
+    
+    # Which of the tenant's fields the assessor is actually in (R-tree lookup)
+    current_field = None if is_within else await FieldIndex.locate(
+        db, current_user.tenant_id, latitude, longitude
+    )
+    
+    if is_within:
+        message = "Arrived at field location. Validated via GPS."
+    elif current_field:
+        message = f"Location is in field {current_field['field_code']}, not the claim's field."
+    else:
+        message = "Location is outside the claim's field boundary."
     
     return {
-        "status": "checked_in",
+        "status": "checked_in" if is_within else "outside_boundary",
         "timestamp": datetime.now(),
-        "is_within_boundary": True, # Mocked
-        "message": "Arrived at field location. Validated via GPS."
+        "is_within_boundary": is_within,
+        "distance_to_boundary_meters": 0.0 if is_within else round(prepared_field.distance_to_boundary_m(latitude, longitude), 1),
+        "current_field": {
+            "field_id": str(field.id), "field_code": field.field_code, "field_name": field.field_name
+        } if is_within else current_field,
+        "message": message
     }
     
     return StreamingResponse(
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, UploadFile, File, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, or_, text
+from sqlalchemy import select, or_
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
@@ -14,7 +16,11 @@ from app.schemas.spatial import (
     FieldCreate, FieldUpdate, FieldResponse,
     SamplingRequest, SamplingResponse
 )
-from app.services.spatial import SpatialService, VerisSpatialError
+from app.services.field_cache import FieldGeometryCache
+from app.services.field_index import FieldIndex
+from app.services.field_import import FieldImportService, FieldImportError
+from app.services.sampling_plans import SamplingPlanService
+from app.services.spatial import SpatialService, VerisSpatialError, detail_for_zoom
 
 router = APIRouter()
 
@@ -68,15 +74,8 @@ async def create_farm(
     
     db.add(db_obj)
     db.commit()
+    # The refresh SELECT also renders farm_location_wkt for the response
     db.refresh(db_obj)
-    
-    # Convert WKT to string for response if needed by Pydantic (though pure WKT usually works)
-    # The response model handles string types
-    if db_obj.farm_location is not None:
-        # Convert internal geometry to WKT for response
-        wkt_query = text("SELECT ST_AsText(:geom)")
-        wkt_res = db.execute(wkt_query, {"geom": db_obj.farm_location}).scalar()
-        db_obj.farm_location = wkt_res
         
     return db_obj
 
@@ -109,17 +108,8 @@ async def list_farms(
     
     query = query.offset(skip).limit(limit).order_by(Farm.created_at.desc())
     
+    # farm_location is rendered as WKT in this same query (farm_location_wkt)
     farms = db.execute(query).scalars().all()
-    
-    # Post-process for WKT output
-    for farm in farms:
-        if farm.farm_location is not None:
-            # We can use ST_AsText in query or just return the object representation if acceptable
-            # For correctness with Pydantic model demanding str, usually safer to query string explicitly
-            # But GeoAlchemy2 elements usually str() to WKT or HEX. Let's see.
-            # Using specific helper if needed. For now assume Pydantic's from_attributes handles it or we map it.
-            # To be safe, let's leave as is, usually GeoAlchemy2 Elements serialize to WKT/HEX string
-            pass
             
     return farms
 
@@ -142,6 +132,34 @@ async def get_farm(
         
     return farm
 
+@router.get("/{farm_id}/fields", response_model=List[FieldResponse])
+async def list_fields(
+    farm_id: UUID,
+    detail: str = Query("full", pattern="^(full|medium|low)$", description="Boundary detail level"),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom; picks the detail level"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    List a farm's fields, with boundaries at the requested detail level.
+    """
+    if zoom is not None:
+        detail = detail_for_zoom(zoom)
+    
+    fields = db.execute(
+        select(Field).join(Farm).where(
+            Field.farm_id == farm_id,
+            Farm.tenant_id == current_user.tenant_id
+        )
+        .options(*SpatialService.boundary_detail_options(detail))
+        .order_by(Field.field_code)
+        .offset(skip).limit(limit)
+    ).scalars().all()
+    
+    return fields
+
 @router.post("/{farm_id}/fields", response_model=FieldResponse, status_code=status.HTTP_201_CREATED)
 async def create_field(
     farm_id: UUID,
@@ -164,13 +182,13 @@ async def create_field(
     if not farm:
         raise HTTPException(status_code=404, detail="Farm not found or access denied")
     
-    # Validate field boundary
-    boundary_validation = await SpatialService.validate_field_boundary(
-        field_data.boundary_coordinates, db
+    # Validate, repair and measure the boundary in one in-process pass
+    field_metrics = await SpatialService.validate_field_boundary(
+        field_data.boundary_coordinates
     )
     
-    if not boundary_validation["valid"]:
-        raise HTTPException(status_code=400, detail=boundary_validation["error"])
+    if not field_metrics["valid"]:
+        raise HTTPException(status_code=400, detail=field_metrics["error"])
     
     # Check uniqueness
     existing_field = db.execute(
@@ -183,17 +201,14 @@ async def create_field(
     if existing_field:
         raise HTTPException(status_code=400, detail="Field code already exists on this farm")
     
-    # Calculate metrics
-    field_metrics = await SpatialService.calculate_field_metrics(
-        field_data.boundary_coordinates, db
-    )
-    
     # Create Field
     db_obj = Field(
         farm_id=farm_id,
         field_code=field_data.field_code,
         field_name=field_data.field_name,
         field_boundary=field_metrics["boundary_wkt"],
+        boundary_medium=field_metrics["boundary_levels"]["medium"],
+        boundary_low=field_metrics["boundary_levels"]["low"],
         field_area=field_metrics["area_hectares"],
         field_center=f"POINT({field_metrics['center_lng']} {field_metrics['center_lat']})",
         soil_characteristics=field_data.soil_characteristics,
@@ -208,9 +223,47 @@ async def create_field(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    FieldIndex.touch(current_user.tenant_id)
     
     return db_obj
 
+@router.post("/{farm_id}/fields/import")
+async def import_fields(
+    farm_id: UUID,
+    file: UploadFile = File(...),
+    code_property: str = Query("field_code", description="Feature property holding the field code"),
+    name_property: str = Query("field_name", description="Feature property holding the field name"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Bulk-create fields from a GeoJSON FeatureCollection or a zipped shapefile.
+    Streams one NDJSON line per feature (field_id or error), then a summary.
+    """
+    farm = db.execute(
+        select(Farm).where(
+            Farm.id == farm_id,
+            Farm.tenant_id == current_user.tenant_id,
+            Farm.is_active == True
+        )
+    ).scalar_one_or_none()
+    
+    if not farm:
+        raise HTTPException(status_code=404, detail="Farm not found or access denied")
+    
+    data = await file.read()
+    try:
+        features = await run_in_threadpool(FieldImportService.read_features, file.filename, data)
+    except FieldImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return StreamingResponse(
+        FieldImportService.import_features(
+            farm_id, features, code_property, name_property, tenant_id=current_user.tenant_id
+        ),
+        media_type="application/x-ndjson"
+    )
+
 @router.post("/{farm_id}/fields/{field_id}/sampling-points", response_model=SamplingResponse)
 async def generate_sampling_points(
     farm_id: UUID,
@@ -234,31 +287,52 @@ async def generate_sampling_points(
     if not field:
         raise HTTPException(status_code=404, detail="Field not found or access denied")
         
-    # Get boundary WKT
-    wkt_query = text("SELECT ST_AsText(field_boundary) FROM fields WHERE id = :field_id")
-    boundary_wkt = db.execute(wkt_query, {"field_id": field_id}).scalar()
-    
-    if not boundary_wkt:
+    # Parsed boundary, reused across requests until the field changes
+    if field.field_boundary is None:
         raise HTTPException(status_code=500, detail="Field boundary data corrupted")
+    prepared_field = FieldGeometryCache.get(field)
         
-    try:
-        sample_points = await SpatialService.generate_sampling_points(
-            field_boundary_wkt=boundary_wkt,
-            min_samples=sampling_request.minimum_samples,
-            method=sampling_request.sampling_method,
-            edge_buffer_meters=sampling_request.edge_buffer_meters,
-            min_distance_meters=sampling_request.min_distance_meters,
-            db=db
+    # Unseeded requests get a seed derived from the request, so repeats hit
+    # the stored plan; an explicit seed asks for a deliberate re-draw
+    parameters = sampling_request.model_dump(mode="json", exclude={"sampling_method", "seed"})
+    seed = sampling_request.seed
+    if seed is None:
+        seed = SamplingPlanService.default_seed(
+            field_id, prepared_field.boundary_hash, sampling_request.sampling_method, parameters
         )
+    plan_key = SamplingPlanService.plan_key(
+        field_id, prepared_field.boundary_hash, sampling_request.sampling_method, parameters, seed
+    )
+    
+    try:
+        # Same field, boundary, method, parameters and seed: serve the stored plan
+        plan = SamplingPlanService.get(db, plan_key)
+        if plan is None:
+            sample_points = await SpatialService.generate_sampling_points(
+                field_boundary_wkt=None,
+                min_samples=sampling_request.minimum_samples,
+                method=sampling_request.sampling_method,
+                edge_buffer_meters=sampling_request.edge_buffer_meters,
+                min_distance_meters=sampling_request.min_distance_meters,
+                db=db,
+                seed=seed,
+                prepared_field=prepared_field
+            )
+            plan = SamplingPlanService.save(
+                db, field_id, plan_key, prepared_field.boundary_hash,
+                sampling_request.sampling_method, parameters, seed, sample_points
+            )
         
         return SamplingResponse(
             field_id=field_id,
             farm_id=farm_id,
             field_area_hectares=float(field.field_area),
-            sampling_method=sampling_request.sampling_method,
-            total_sample_points=len(sample_points),
-            sample_points=sample_points,
-            generation_timestamp=datetime.utcnow(),
+            sampling_method=plan.sampling_method,
+            seed=plan.seed,
+            plan_id=plan.id,
+            total_sample_points=len(plan.sample_points),
+            sample_points=plan.sample_points,
+            generation_timestamp=plan.created_at,
             gps_accuracy_requirements={
                 "minimum_accuracy_meters": 1.0,
                 "required_satellites": 8,
@@ -1,21 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
+from sqlalchemy.dialects.postgresql import insert
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from uuid import UUID
 
 from app.db.session import get_db
+from app.db.geometry import row_to_dict
 from app.api.v1.auth import get_current_user
-from app.models.tenant import User
+from app.models.tenant import User, DeviceRegistration
 from app.models.claims import Claim, AssessmentSession, AssessmentSample, ClaimStatus, AssessmentStatus
 from app.models.spatial import Farm, Field
+from app.services.spatial import SpatialService, detail_for_zoom
 
 router = APIRouter()
 
 @router.get("/down")
 async def sync_down(
     last_sync: Optional[datetime] = None,
+    detail: str = Query("full", pattern="^(full|medium|low)$", description="Field boundary detail level"),
+    zoom: Optional[int] = Query(None, ge=0, le=22, description="Map zoom; picks the detail level"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -43,32 +48,21 @@ async def sync_down(
     farms = []
     fields = []
     
-    from geoalchemy2.shape import to_shape
-
+    # Geometry comes back as WKT from the same queries (row_to_dict)
     if farm_ids:
-        farms = db.execute(select(Farm).where(Farm.id.in_(farm_ids))).scalars().all()
-        # Convert Geometry to WKT for serialization
-        for farm in farms:
-            if farm.farm_location is not None and not isinstance(farm.farm_location, str):
-                try:
-                    farm.farm_location = to_shape(farm.farm_location).wkt
-                except Exception as e:
-                    print(f"Error converting farm location: {e}")
+        farms = [row_to_dict(farm) for farm in db.execute(select(Farm).where(Farm.id.in_(farm_ids))).scalars()]
 
     if field_ids:
-        fields = db.execute(select(Field).where(Field.id.in_(field_ids))).scalars().all()
-        # Convert Geometry to WKT for serialization
-        for field in fields:
-             if field.field_boundary is not None and not isinstance(field.field_boundary, str):
-                try:
-                    field.field_boundary = to_shape(field.field_boundary).wkt
-                except Exception as e:
-                    print(f"Error converting field boundary: {e}")
-             if field.field_center is not None and not isinstance(field.field_center, str):
-                try:
-                    field.field_center = to_shape(field.field_center).wkt
-                except Exception as e:
-                    print(f"Error converting field center: {e}")
+        if zoom is not None:
+            detail = detail_for_zoom(zoom)
+        fields = [
+            row_to_dict(field)
+            for field in db.execute(
+                select(Field)
+                .where(Field.id.in_(field_ids))
+                .options(*SpatialService.boundary_detail_options(detail))
+            ).scalars()
+        ]
         
     return {
         "timestamp": datetime.utcnow(),
@@ -85,10 +79,47 @@ async def sync_up(
 ):
     """
     Upload offline Assessment Sessions and Samples.
-    Payload format: { "sessions": [...], "samples": [...] }
+    Payload format: { "sessions": [...], "samples": [...], "device": {...} }
+    "device" (device_id, latitude, longitude, optional device_name /
+    device_type / app_version) records the device's last position, used
+    for proximity-based claim assignment.
     """
     sessions_data = payload.get("sessions", [])
     samples_data = payload.get("samples", [])
+    device = payload.get("device")
+    
+    if device and device.get("device_id"):
+        values = {
+            "user_id": current_user.id,
+            "device_name": device.get("device_name"),
+            "device_type": device.get("device_type"),
+            "app_version": device.get("app_version"),
+            "is_active": True,
+            "last_seen_at": func.now()
+        }
+        if device.get("latitude") is not None and device.get("longitude") is not None:
+            try:
+                lat, lng = float(device["latitude"]), float(device["longitude"])
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Device latitude/longitude must be numbers")
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                raise HTTPException(status_code=400, detail="Device latitude/longitude out of range")
+            values["last_location"] = f"SRID=4326;POINT({lng} {lat})"
+        stmt = insert(DeviceRegistration).values(device_id=str(device["device_id"])[:100], **values)
+        registered = db.execute(stmt.on_conflict_do_update(
+            index_elements=[DeviceRegistration.device_id],
+            # A position-only report keeps the stored device details
+            set_={
+                key: func.coalesce(stmt.excluded[key], getattr(DeviceRegistration, key))
+                if key in ("device_name", "device_type", "app_version") else stmt.excluded[key]
+                for key in values
+            },
+            # Only the device's own user may update it
+            where=DeviceRegistration.user_id == current_user.id
+        ).returning(DeviceRegistration.id)).scalar()
+        if registered is None:
+            db.rollback()
+            raise HTTPException(status_code=403, detail="Device is registered to another user")
     
     synced_ids = {"sessions": [], "samples": []}
     
@@ -113,6 +144,7 @@ async def sync_up(
                 assessor_id=current_user.id,
                 assessment_method=s_dat.get("assessment_method"),
                 growth_stage=s_dat.get("growth_stage"),
+                sampling_plan_id=s_dat.get("sampling_plan_id"),
                 status=AssessmentStatus.SYNCED,
                 created_at=s_dat.get("created_at")
             )
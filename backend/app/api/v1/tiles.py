@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.db.session import get_db, run_in_db_pool
+from app.api.v1.auth import get_current_user
+from app.models.tenant import User
+from app.services.tiles import VectorTileService
+
+router = APIRouter()
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+
+@router.get("/{z}/{x}/{y}.mvt")
+async def get_tile(
+    z: int,
+    x: int,
+    y: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Vector tile ("fields" layer) of the tenant's fields with their latest
+    claim's id, number and status. Responses carry an ETag of the tenant's
+    map data version, so unchanged tiles revalidate with a 304.
+    """
+    if not VectorTileService.valid_tile(z, x, y):
+        raise HTTPException(status_code=400, detail="Invalid tile coordinates")
+
+    tenant_id = current_user.tenant_id
+    version = await run_in_db_pool(VectorTileService.data_version, db, tenant_id)
+    etag = VectorTileService.etag(tenant_id, version)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+
+    tile = await run_in_db_pool(VectorTileService.get_tile, db, tenant_id, version, z, x, y)
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=headers)
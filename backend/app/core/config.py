@@ -17,6 +17,9 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # Worker threads for blocking Session work offloaded from async services
+    # (keep at or below the engine's pool_size + max_overflow, 15 by default)
+    DB_THREADPOOL_SIZE: int = 8
     
     # JWT Authentication
     SECRET_KEY: str
@@ -32,6 +35,28 @@ class Settings(BaseSettings):
             return [i.strip() for i in v.split(",")]
         return v
     
+    # Calculation result cache (per worker process); 0 disables caching
+    CALCULATION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    
+    # Bootstrap confidence intervals: replicates and hard time budget per request
+    BOOTSTRAP_REPLICATES: int = 10000
+    BOOTSTRAP_TIME_BUDGET_MS: float = 15.0
+    
+    # Parsed/prepared field boundaries kept per worker (LRU)
+    FIELD_GEOMETRY_CACHE_SIZE: int = 2048
+    
+    # Seconds between incremental refreshes of the per-tenant field R-tree
+    FIELD_INDEX_REFRESH_SECONDS: float = 30.0
+    
+    # Rendered vector tiles, cached per tenant and map data version
+    TILE_CACHE_DIR: str = "cache/tiles"
+    
+    # Proximity assignment: open claims per assessor, KNN candidates per
+    # claim, and how recent a device position must be to count
+    ASSIGNMENT_MAX_OPEN_CLAIMS: int = 15
+    ASSIGNMENT_CANDIDATES_PER_CLAIM: int = 8
+    ASSIGNMENT_DEVICE_MAX_AGE_HOURS: float = 24.0
+    
     # AWS S3 (for evidence storage)
     AWS_ACCESS_KEY_ID: str = ""
     AWS_SECRET_ACCESS_KEY: str = ""
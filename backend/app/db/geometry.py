@@ -0,0 +1,51 @@
+"""
+Server-side geometry serialization.
+
+Geometry columns get a read-only "<column>_wkt" companion rendered by PostGIS
+(ST_AsText) in the same SELECT as the row, so responses never build Shapely
+objects per row or run follow-up conversion queries.
+"""
+from sqlalchemy import func, inspect
+from sqlalchemy.orm import column_property, query_expression
+from typing import Dict, Any
+
+from pydantic import AliasChoices, Field as PydanticField
+
+WKT_SUFFIX = "_wkt"
+
+
+def wkt_property(column):
+    """ST_AsText(column) loaded with the row, e.g. field_boundary_wkt."""
+    return column_property(func.ST_AsText(column))
+
+
+def wkt_expression(column):
+    """
+    Like wkt_property, but a query can swap the rendered geometry with
+    with_expression() (e.g. a simplified boundary level).
+    """
+    return query_expression(func.ST_AsText(column))
+
+
+def wkt_field(name: str, default: Any = None):
+    """
+    Pydantic field for a geometry attribute returned as WKT: read from the
+    "<name>_wkt" property on ORM rows, or from "<name>" on plain dicts.
+    """
+    return PydanticField(default, validation_alias=AliasChoices(name + WKT_SUFFIX, name))
+
+
+def row_to_dict(obj) -> Dict[str, Any]:
+    """
+    Column values of an ORM row, with each geometry column replaced by its
+    server-rendered WKT. Deferred columns are left out (no per-row loads).
+    Shared by endpoints that return rows without a schema.
+    """
+    attrs = inspect(obj).mapper.column_attrs
+    row = {}
+    for attr in attrs:
+        if attr.key.endswith(WKT_SUFFIX) or attr.deferred:
+            continue
+        wkt_key = attr.key + WKT_SUFFIX
+        row[attr.key] = getattr(obj, wkt_key if wkt_key in attrs else attr.key)
+    return row
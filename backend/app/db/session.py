@@ -3,7 +3,10 @@ Database session management with multi-tenant support.
 """
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, Callable, TypeVar
+import asyncio
+import functools
 
 from app.core.config import settings
 
@@ -18,6 +21,14 @@ engine = create_engine(
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Bounded pool for blocking Session work called from async code
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_THREADPOOL_SIZE,
+    thread_name_prefix="db"
+)
+
+T = TypeVar("T")
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -34,3 +45,14 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def run_in_db_pool(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Runs a blocking function (typically one using a sync Session) on the
+    bounded DB thread pool so it doesn't stall the event loop.
+    The caller awaits the result, so a Session is still only used by one
+    thread at a time.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, functools.partial(func, *args, **kwargs))
@@ -1,12 +1,32 @@
 """
 FastAPI main application.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.lookup_seeding import LookupSeeder
 from fastapi.staticfiles import StaticFiles
-from app.api.v1 import auth, users, farms, claims, calculations, evidence, sync
+from app.api.v1 import auth, users, farms, claims, calculations, evidence, sync, tiles
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Seed USDA lookup tables once per process so request paths never check."""
+    db = SessionLocal()
+    try:
+        seeded = LookupSeeder.seed_all(db)
+        if seeded:
+            print(f"Seeded lookup tables: {', '.join(seeded)}")
+    except Exception as e:
+        # Don't block startup; calculations fall back to defaults until seeded
+        print(f"Warning: Lookup table seeding failed: {e}")
+    finally:
+        db.close()
+    yield
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -15,6 +35,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -42,6 +63,7 @@ app.include_router(claims.router, prefix=f"{settings.API_V1_PREFIX}/claims", tag
 app.include_router(calculations.router, prefix=f"{settings.API_V1_PREFIX}/calculations", tags=["calculations"])
 app.include_router(evidence.router, prefix=f"{settings.API_V1_PREFIX}/evidence", tags=["evidence"])
 app.include_router(sync.router, prefix=f"{settings.API_V1_PREFIX}/sync", tags=["sync"])
+app.include_router(tiles.router, prefix=f"{settings.API_V1_PREFIX}/tiles", tags=["tiles"])
 # Add Roles Router (New)
 from app.api.v1 import roles
 app.include_router(roles.router, prefix=f"{settings.API_V1_PREFIX}/roles", tags=["roles"])
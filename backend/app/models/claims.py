@@ -7,6 +7,7 @@ import uuid
 import enum
 
 from app.db.base import Base
+from app.db.geometry import wkt_property
 
 class ClaimStatus(str, enum.Enum):
     REPORTED = "reported"
@@ -86,6 +87,7 @@ class AssessmentSession(Base):
     # Methodology
     assessment_method = Column(String(50), nullable=False) # stand_reduction, hail_count, etc.
     growth_stage = Column(String(50)) # V1, V2... VT, R1...
+    sampling_plan_id = Column(UUID(as_uuid=True), ForeignKey("sampling_plans.id")) # Points issued to the assessor
     
     # Conditions
     weather_conditions = Column(JSON) # {temp, wind, cloud_cover}
@@ -116,6 +118,7 @@ class AssessmentSample(Base):
     
     # Location verification
     sample_location = Column(Geometry('POINT', 4326))
+    sample_location_wkt = wkt_property(sample_location)
     gps_accuracy_meters = Column(Float)
     timestamp = Column(DateTime(timezone=True), default=func.now())
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Boolean, Index, UniqueConstraint, DateTime
+from sqlalchemy import Column, String, Integer, BigInteger, Float, ForeignKey, Boolean, Index, UniqueConstraint, DateTime, Date, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -28,10 +28,53 @@ class LookupTable(Base):
     # Metadata for complex logic (e.g., interpolation grouping)
     metadata_json = Column(JSONB)
     
+    # Snapshot version at which this cell last changed (see LookupTableVersion)
+    row_version = Column(BigInteger, nullable=False, default=0)
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     __table_args__ = (
         UniqueConstraint('table_name', 'input_value', 'stage_or_condition', name='unique_lookup_cell'),
         Index('idx_lookup_query', 'table_name', 'input_value', 'stage_or_condition'),
+        Index('idx_lookup_row_version', 'row_version'),
+    )
+
+class LookupSeedVersion(Base):
+    """
+    Marker recording which version of the bundled USDA chart data
+    has been seeded into lookup_tables, one row per table.
+    """
+    __tablename__ = "lookup_seed_versions"
+    
+    table_name = Column(String(50), primary_key=True)
+    seed_version = Column(Integer, nullable=False)
+    seeded_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class LookupTableVersion(Base):
+    """
+    One row per change to a lookup table (seeding, admin edit).
+    snapshot_version is a single monotonic counter across all tables, used as
+    the ETag / since_version for offline sync of lookup_tables.
+    """
+    __tablename__ = "lookup_table_versions"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Original design keyed on lookup_table_definitions (unused by the API)
+    table_definition_id = Column(UUID(as_uuid=True))
+    lookup_table_name = Column(String(50))
+    snapshot_version = Column(BigInteger)
+    
+    version_number = Column(String(20), nullable=False)
+    effective_date = Column(Date, nullable=False)
+    deprecated_date = Column(Date)
+    change_description = Column(Text)
+    is_current_version = Column(Boolean, default=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_lookup_versions_snapshot', 'snapshot_version'),
+        Index('idx_lookup_versions_name', 'lookup_table_name', 'is_current_version'),
     )
@@ -1,12 +1,13 @@
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text, UniqueConstraint, Index
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, DateTime, ForeignKey, Text, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.types import DECIMAL
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from geoalchemy2 import Geometry
 import uuid
 
 from app.db.base import Base
+from app.db.geometry import wkt_property, wkt_expression
 
 class Farm(Base):
     __tablename__ = "farms"
@@ -23,6 +24,7 @@ class Farm(Base):
     
     # Spatial data
     farm_location = Column(Geometry('POINT', 4326))  # Farm center point
+    farm_location_wkt = wkt_property(farm_location)
     farm_address = Column(JSONB)
     total_farm_area = Column(DECIMAL(10,2))  # Hectares
     operational_area = Column(DECIMAL(10,2))  # Cultivated area
@@ -64,6 +66,12 @@ class Field(Base):
     field_boundary = Column(Geometry('POLYGON', 4326), nullable=False)  # GPS boundary
     field_area = Column(DECIMAL(8,2), nullable=False)  # Auto-calculated from boundary
     field_center = Column(Geometry('POINT', 4326))  # Auto-calculated centroid
+    field_boundary_wkt = wkt_expression(field_boundary)
+    
+    # Simplified boundaries for map / sync payloads (see BOUNDARY_DETAIL_TOLERANCES)
+    boundary_medium = deferred(Column(Geometry('POLYGON', 4326)))
+    boundary_low = deferred(Column(Geometry('POLYGON', 4326)))
+    field_center_wkt = wkt_property(field_center)
     
     # Field characteristics
     soil_characteristics = Column(JSONB)  # Type, pH, fertility, drainage
@@ -90,3 +98,34 @@ class Field(Base):
         Index('idx_fields_boundary', 'field_boundary', postgresql_using='gist'),
         Index('idx_fields_center', 'field_center', postgresql_using='gist'),
     )
+
+class SamplingPlan(Base):
+    """
+    Sampling points issued for a field, stored once per plan_key
+    (field, boundary hash, method, parameters, seed) so repeat requests
+    and later audits read the same plan instead of regenerating it.
+    """
+    __tablename__ = "sampling_plans"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    field_id = Column(UUID(as_uuid=True), ForeignKey("fields.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    plan_key = Column(String(64), nullable=False, unique=True)
+    boundary_hash = Column(String(64), nullable=False)
+    sampling_method = Column(String(20), nullable=False)
+    parameters = Column(JSONB, nullable=False)  # minimum_samples, buffers, spacing
+    seed = Column(BigInteger, nullable=False)
+    sample_points = Column(JSONB, nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class MapDataVersion(Base):
+    """
+    Per-tenant version of the map data (fields and claims), bumped by
+    database triggers on every write; vector tiles are cached under it.
+    """
+    __tablename__ = "map_data_versions"
+    
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,9 +1,10 @@
 """
 Tenant model - Multi-tenant organization management.
 """
-from sqlalchemy import Column, String, Boolean, TIMESTAMP, JSON, Index
+from sqlalchemy import Column, String, Boolean, Integer, TIMESTAMP, JSON, Index, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
+from geoalchemy2 import Geometry
 import uuid
 
 from app.db.base import Base
@@ -100,3 +101,29 @@ class User(Base):
         Index('idx_users_tenant', 'tenant_id'),
         Index('idx_users_active', 'is_active', 'tenant_id'),
     )
+
+
+class DeviceRegistration(Base):
+    """
+    A user's mobile device and its last reported GPS position
+    (used to assign claims to the nearest assessor).
+    """
+    __tablename__ = "device_registrations"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    device_id = Column(String(100), unique=True, nullable=False)
+    device_name = Column(String(100))
+    device_type = Column(String(30))
+    device_os_version = Column(String(50))
+    app_version = Column(String(20))
+    gps_capable = Column(Boolean, default=True)
+    camera_capable = Column(Boolean, default=True)
+    offline_storage_mb = Column(Integer)
+    
+    last_location = Column(Geometry('POINT', 4326))
+    is_active = Column(Boolean, default=True)
+    registration_date = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    last_seen_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    total_assessments_completed = Column(Integer, default=0)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
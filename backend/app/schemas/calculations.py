@@ -73,9 +73,20 @@ class CalculationRequest(BaseModel):
     # Optional global parameters for new methods
     expected_final_moisture: Optional[float] = 15.0
 
+    # Blend adjacent chart columns when growth_stage falls between them
+    # (e.g. a stage from /stage-modification that the exhibit doesn't chart)
+    interpolate_stages: bool = False
+
+    # Add bootstrap 90/95% confidence intervals (stand reduction, hail, weight method)
+    uncertainty: bool = False
+
 class CalculationResult(BaseModel):
     method: str
     growth_stage: str
     loss_percentage: float
     average_potential_yield_pct: float
+    # Request-level tables/factors resolved before the sample loop (for audit)
+    calculation_plan: Optional[Dict[str, Any]] = None
+    # Bootstrap confidence intervals, present when requested with uncertainty=True
+    uncertainty: Optional[Dict[str, Any]] = None
     sample_details: List[Dict[str, Any]]
@@ -4,6 +4,8 @@ from uuid import UUID
 from datetime import datetime
 from enum import Enum
 
+from app.db.geometry import wkt_field
+
 # --- Enums ---
 
 class ClaimStatusEnum(str, Enum):
@@ -36,7 +38,23 @@ class ClaimBase(BaseModel):
     loss_description: Optional[str] = None
 
 class ClaimCreate(ClaimBase):
-    pass
+    auto_assign: bool = False # Nearest available assessor when no email is given
+
+class ClaimAssignmentRequest(BaseModel):
+    claim_ids: Optional[List[UUID]] = None # Default: all reported, unassigned claims
+    max_open_claims: Optional[int] = Field(None, ge=1, le=500)
+    max_distance_km: Optional[float] = Field(None, gt=0)
+    candidates_per_claim: Optional[int] = Field(None, ge=1, le=50)
+
+class ClaimAssignment(BaseModel):
+    claim_id: UUID
+    claim_number: str
+    assessor_id: UUID
+    distance_km: float
+
+class ClaimAssignmentResponse(BaseModel):
+    assigned: List[ClaimAssignment]
+    unassigned: List[UUID]
 
 class ClaimUpdate(BaseModel):
     status: Optional[ClaimStatusEnum] = None
@@ -79,7 +97,7 @@ class AssessmentSampleCreate(AssessmentSampleBase):
 class AssessmentSampleResponse(AssessmentSampleBase):
     id: UUID
     session_id: UUID
-    sample_location: Optional[str] = None # WKT
+    sample_location: Optional[str] = wkt_field("sample_location") # WKT
     timestamp: datetime
     
     class Config:
@@ -93,6 +111,7 @@ class AssessmentSessionBase(BaseModel):
     weather_conditions: Optional[Dict[str, Any]] = None
     crop_conditions: Optional[Dict[str, Any]] = None
     assessor_notes: Optional[str] = None
+    sampling_plan_id: Optional[UUID] = None
 
 class AssessmentSessionCreate(AssessmentSessionBase):
     claim_id: UUID
@@ -3,6 +3,8 @@ from pydantic import BaseModel, Field, validator
 from uuid import UUID
 from datetime import datetime
 
+from app.db.geometry import wkt_field
+
 # --- Shared Components ---
 
 class GeoPoint(BaseModel):
@@ -48,7 +50,7 @@ class FarmUpdate(BaseModel):
 class FarmResponse(FarmBase):
     id: UUID
     tenant_id: UUID
-    farm_location: Optional[str] = None # WKT format or similar
+    farm_location: Optional[str] = wkt_field("farm_location") # WKT
     total_farm_area: Optional[float]
     operational_area: Optional[float]
     is_active: bool
@@ -89,9 +91,9 @@ class FieldUpdate(BaseModel):
 class FieldResponse(FieldBase):
     id: UUID
     farm_id: UUID
-    field_boundary: str # WKT
+    field_boundary: str = wkt_field("field_boundary", ...) # WKT
     field_area: float # Hectares
-    field_center: Optional[str] # WKT or string rep
+    field_center: Optional[str] = wkt_field("field_center") # WKT
     created_at: datetime
     updated_at: Optional[datetime]
     
@@ -102,9 +104,11 @@ class FieldResponse(FieldBase):
 
 class SamplingRequest(BaseModel):
     minimum_samples: int = Field(5, ge=3, le=50)
-    sampling_method: str = Field("random", pattern="^(random|grid|stratified)$")
+    sampling_method: str = Field("random", pattern="^(random|systematic|grid|stratified|poisson_disk)$")
     edge_buffer_meters: float = Field(5.0, ge=0.0)
     min_distance_meters: float = Field(20.0, ge=1.0)
+    # Same seed + field + parameters reproduces the same points; derived from the request if omitted
+    seed: Optional[int] = Field(None, ge=0, le=2**63 - 1)  # sampling_plans.seed is BIGINT
 
 class SamplingPoint(BaseModel):
     sample_number: int
@@ -119,6 +123,8 @@ class SamplingResponse(BaseModel):
     farm_id: UUID
     field_area_hectares: float
     sampling_method: str
+    seed: Optional[int] = None
+    plan_id: Optional[UUID] = None
     total_sample_points: int
     sample_points: List[SamplingPoint]
     generation_timestamp: datetime
@@ -0,0 +1,198 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func, text
+from typing import List, Dict, Any, Optional
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.claims import Claim, ClaimStatus
+from app.models.spatial import Field
+
+# Claim statuses that count against an assessor's workload cap
+OPEN_CLAIM_STATUSES = (ClaimStatus.ASSIGNED, ClaimStatus.IN_PROGRESS)
+
+_EARTH_RADIUS_M = 6371008.8
+
+# K nearest active devices per claim, in one statement: the LATERAL
+# subquery is an index-ordered KNN scan (<->) on device_registrations.last_location
+_NEAREST_DEVICES_SQL = """
+SELECT c.claim_id, d.user_id,
+       ST_Distance(c.center::geography, d.last_location::geography) AS distance_m
+FROM (
+    SELECT claims.id AS claim_id, fields.field_center AS center
+    FROM claims JOIN fields ON fields.id = claims.field_id
+    WHERE claims.id = ANY(:claim_ids) AND fields.field_center IS NOT NULL
+) c
+CROSS JOIN LATERAL (
+    SELECT device_registrations.user_id, device_registrations.last_location
+    FROM device_registrations
+    JOIN users ON users.id = device_registrations.user_id
+    WHERE users.tenant_id = :tenant_id
+      AND users.is_active
+      AND device_registrations.is_active
+      AND device_registrations.last_location IS NOT NULL
+      AND device_registrations.last_seen_at >= :seen_since
+    ORDER BY device_registrations.last_location <-> c.center
+    LIMIT :k
+) d
+"""
+
+_ASSESSOR_LOCATIONS_SQL = """
+SELECT DISTINCT ON (device_registrations.user_id)
+       device_registrations.user_id,
+       ST_X(device_registrations.last_location) AS lng,
+       ST_Y(device_registrations.last_location) AS lat
+FROM device_registrations
+JOIN users ON users.id = device_registrations.user_id
+WHERE users.tenant_id = :tenant_id
+  AND users.is_active
+  AND device_registrations.is_active
+  AND device_registrations.last_location IS NOT NULL
+  AND device_registrations.last_seen_at >= :seen_since
+ORDER BY device_registrations.user_id, device_registrations.last_seen_at DESC
+"""
+
+
+def _haversine_m(lat1, lng1, lat2, lng2) -> np.ndarray:
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class AssessorAssignmentService:
+    """
+    Batch assignment of unassigned claims to the nearest available assessor.
+    Assessors are users with an active device that reported a position
+    recently (device_registrations.last_location). One KNN query returns each
+    claim's nearest devices; pairs are then taken greedily from the shortest
+    distance up, skipping assessors at their open-claim cap. Claims whose
+    candidates are all full fall back to the nearest assessor with room.
+    """
+
+    @staticmethod
+    def _workloads(db: Session, tenant_id) -> Dict[Any, int]:
+        rows = db.execute(
+            select(Claim.assigned_assessor_id, func.count())
+            .where(
+                Claim.tenant_id == tenant_id,
+                Claim.assigned_assessor_id.isnot(None),
+                Claim.status.in_(OPEN_CLAIM_STATUSES)
+            )
+            .group_by(Claim.assigned_assessor_id)
+        ).all()
+        return {assessor_id: count for assessor_id, count in rows}
+
+    @classmethod
+    def assign(cls, db: Session, tenant_id,
+               claim_ids: Optional[List[Any]] = None,
+               max_open_claims: Optional[int] = None,
+               max_distance_km: Optional[float] = None,
+               candidates_per_claim: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Assigns the tenant's reported, unassigned claims (or just claim_ids)
+        and commits. Returns the assignments with distances and the claims
+        left unassigned (no assessor in range or all at capacity).
+        """
+        max_open_claims = max_open_claims or settings.ASSIGNMENT_MAX_OPEN_CLAIMS
+        k = candidates_per_claim or settings.ASSIGNMENT_CANDIDATES_PER_CLAIM
+        max_distance_m = max_distance_km * 1000 if max_distance_km else None
+        seen_since = datetime.now(timezone.utc) - timedelta(hours=settings.ASSIGNMENT_DEVICE_MAX_AGE_HOURS)
+
+        # Lock the batch so a concurrent run can't assign the same claims.
+        # Plain columns, not ORM rows: nothing is expired (and reloaded per
+        # claim) by the commit below
+        query = select(Claim.id, Claim.claim_number).where(
+            Claim.tenant_id == tenant_id,
+            Claim.assigned_assessor_id.is_(None),
+            Claim.status == ClaimStatus.REPORTED
+        )
+        if claim_ids:
+            query = query.where(Claim.id.in_(claim_ids))
+        claim_numbers = dict(db.execute(query.with_for_update(skip_locked=True)).all())
+        if not claim_numbers:
+            db.rollback()
+            return {"assigned": [], "unassigned": []}
+
+        # Devices per claim over-fetched: a user may carry several
+        pairs = db.execute(
+            text(_NEAREST_DEVICES_SQL),
+            {"claim_ids": list(claim_numbers), "tenant_id": tenant_id, "seen_since": seen_since, "k": k * 2}
+        ).all()
+        candidates = sorted((row.distance_m, row.claim_id, row.user_id) for row in pairs)
+
+        load = cls._workloads(db, tenant_id)
+        assignments: Dict[Any, tuple] = {}
+        cls._take(candidates, assignments, load, max_open_claims, max_distance_m)
+
+        leftover = [claim_id for claim_id in claim_numbers if claim_id not in assignments]
+        if leftover:
+            cls._take(cls._fallback(db, tenant_id, leftover, seen_since, load, max_open_claims),
+                      assignments, load, max_open_claims, max_distance_m)
+
+        if assignments:
+            db.execute(
+                update(Claim),
+                [
+                    {"id": claim_id, "assigned_assessor_id": assessor_id, "status": ClaimStatus.ASSIGNED}
+                    for claim_id, (assessor_id, _) in assignments.items()
+                ]
+            )
+        db.commit()
+
+        return {
+            "assigned": [
+                {
+                    "claim_id": claim_id,
+                    "claim_number": claim_numbers[claim_id],
+                    "assessor_id": assessor_id,
+                    "distance_km": round(distance_m / 1000, 3)
+                }
+                for claim_id, (assessor_id, distance_m) in assignments.items()
+            ],
+            "unassigned": [claim_id for claim_id in claim_numbers if claim_id not in assignments]
+        }
+
+    @staticmethod
+    def _take(candidates, assignments: Dict[Any, tuple], load: Dict[Any, int],
+              max_open_claims: int, max_distance_m: Optional[float]):
+        """Greedy pass over (distance_m, claim_id, assessor_id), shortest first."""
+        for distance_m, claim_id, assessor_id in candidates:
+            if max_distance_m is not None and distance_m > max_distance_m:
+                break
+            if claim_id in assignments or load.get(assessor_id, 0) >= max_open_claims:
+                continue
+            assignments[claim_id] = (assessor_id, distance_m)
+            load[assessor_id] = load.get(assessor_id, 0) + 1
+
+    @staticmethod
+    def _fallback(db: Session, tenant_id, claim_ids: List[Any], seen_since,
+                  load: Dict[Any, int], max_open_claims: int) -> List[tuple]:
+        """
+        Candidates for claims whose KNN neighbours are all at capacity: every
+        assessor with room, by great-circle distance (one matrix, in-process).
+        """
+        assessors = [row for row in db.execute(
+            text(_ASSESSOR_LOCATIONS_SQL), {"tenant_id": tenant_id, "seen_since": seen_since}
+        ).all() if load.get(row.user_id, 0) < max_open_claims]
+        if not assessors:
+            return []
+
+        centers = db.execute(
+            select(Claim.id, func.ST_Y(Field.field_center), func.ST_X(Field.field_center))
+            .join(Field, Field.id == Claim.field_id)
+            .where(Claim.id.in_(claim_ids), Field.field_center.isnot(None))
+        ).all()
+        if not centers:
+            return []
+
+        claim_lat = np.array([row[1] for row in centers], dtype=float)[:, None]
+        claim_lng = np.array([row[2] for row in centers], dtype=float)[:, None]
+        distances = _haversine_m(
+            claim_lat, claim_lng,
+            np.array([row.lat for row in assessors], dtype=float)[None, :],
+            np.array([row.lng for row in assessors], dtype=float)[None, :]
+        )
+        order = np.argsort(distances, axis=None)
+        rows, cols = np.unravel_index(order, distances.shape)
+        return [(float(distances[i, j]), centers[i][0], assessors[j].user_id) for i, j in zip(rows, cols)]
@@ -0,0 +1,75 @@
+from typing import Dict, Any, Optional
+import time
+
+import numpy as np
+
+from app.core.config import settings
+
+# Confidence level -> (lower, upper) percentiles
+CONFIDENCE_LEVELS = {"ci90": (5.0, 95.0), "ci95": (2.5, 97.5)}
+
+
+class BootstrapService:
+    """
+    Percentile bootstrap confidence intervals for per-sample averages.
+    Replicates are drawn as index matrices and averaged with NumPy, in
+    blocks, so the only Python loop is over blocks checked against the time budget.
+    """
+
+    # Index matrix cells per block (bounds memory for large sample sets)
+    block_cells = 200_000
+
+    @classmethod
+    def intervals(
+        cls,
+        metrics: Dict[str, np.ndarray],
+        replicates: Optional[int] = None,
+        time_budget_ms: Optional[float] = None,
+        seed: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resamples the samples with replacement and returns 90/95% percentile
+        intervals of the mean for every metric (all metrics share the same
+        resamples). Stops early when the time budget runs out and reports how
+        many replicates were used. Seeded, so identical inputs give identical
+        intervals when every replicate runs; a truncated run depends on timing
+        (and is not kept by CalculationResultCache).
+        Returns None when there are no samples.
+        """
+        replicates = replicates or settings.BOOTSTRAP_REPLICATES
+        budget = (time_budget_ms if time_budget_ms is not None else settings.BOOTSTRAP_TIME_BUDGET_MS) / 1000.0
+
+        values = {name: np.asarray(v, dtype=float) for name, v in metrics.items()}
+        n = len(next(iter(values.values()), []))
+        if n == 0:
+            return None
+
+        started = time.perf_counter()
+        rng = np.random.default_rng(seed)
+        block = max(1, min(replicates, cls.block_cells // n))
+        means = {name: [] for name in values}
+        done = 0
+
+        while done < replicates:
+            size = min(block, replicates - done)
+            idx = rng.integers(0, n, size=(size, n))
+            for name, v in values.items():
+                means[name].append(v[idx].mean(axis=1))
+            done += size
+            if time.perf_counter() - started > budget:
+                break
+
+        result = {}
+        for name, v in values.items():
+            replicate_means = np.concatenate(means[name])
+            result[name] = {"estimate": round(float(v.mean()), 2)}
+            for level, (lo, hi) in CONFIDENCE_LEVELS.items():
+                bounds = np.percentile(replicate_means, [lo, hi])
+                result[name][level] = [round(float(bounds[0]), 2), round(float(bounds[1]), 2)]
+
+        return {
+            "method": "percentile_bootstrap",
+            "replicates": done,
+            "truncated": done < replicates,
+            "intervals": result
+        }
@@ -1,9 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_, desc, asc
 from typing import List, Dict, Any, Optional, Tuple
 import math
 
-from app.models.lookup import LookupTable
+import numpy as np
+
+from app.services.lookup_cache import LookupTableCache
+from app.services.lookup_seeding import LookupSeeder
+from app.services.bootstrap import BootstrapService
 
 class CalculationService:
     """
@@ -55,66 +58,177 @@ class CalculationService:
         """
         Retrieves a value from a lookup table with Linear Interpolation.
         Formula: y = y1 + (x - x1) * (y2 - y1) / (x2 - x1)
+        Served from the process-wide LookupTableCache; the DB is only hit
+        the first time a table is used (or after invalidation), off the event loop.
         """
-        # Try exact match first
-        exact_query = select(LookupTable).where(
-            LookupTable.table_name == table_name,
-            LookupTable.input_value == input_value
-        )
-        if stage_column:
-            exact_query = exact_query.where(LookupTable.stage_or_condition == stage_column)
-            
-        exact_match = db.execute(exact_query).scalar_one_or_none()
-        if exact_match:
-            return exact_match.output_value
-            
-        # If no exact match, find upper and lower bounds for interpolation
-        # Lower bound (closest value <= input)
-        lower_query = select(LookupTable).where(
-            LookupTable.table_name == table_name,
-            LookupTable.input_value <= input_value
-        )
-        if stage_column:
-            lower_query = lower_query.where(LookupTable.stage_or_condition == stage_column)
-        lower_query = lower_query.order_by(desc(LookupTable.input_value)).limit(1)
-        lower_bound = db.execute(lower_query).scalar_one_or_none()
-        
-        # Upper bound (closest value >= input)
-        upper_query = select(LookupTable).where(
-            LookupTable.table_name == table_name,
-            LookupTable.input_value >= input_value
-        )
-        if stage_column:
-            upper_query = upper_query.where(LookupTable.stage_or_condition == stage_column)
-        upper_query = upper_query.order_by(asc(LookupTable.input_value)).limit(1)
-        upper_bound = db.execute(upper_query).scalar_one_or_none()
-        
-        if not lower_bound or not upper_bound:
-            raise ValueError(f"Value {input_value} out of range for table {table_name}")
-            
-        if lower_bound.id == upper_bound.id:
-            return lower_bound.output_value
-            
-        # Perform Linear Interpolation
-        x = input_value
-        x1 = lower_bound.input_value
-        x2 = upper_bound.input_value
-        y1 = lower_bound.output_value
-        y2 = upper_bound.output_value
-        
-        # Avoid division by zero
-        if x2 == x1:
-            return y1
-            
-        y = y1 + (x - x1) * (y2 - y1) / (x2 - x1)
-        return round(y, 2)
+        table = await LookupTableCache.load(db, table_name)
+        series = table.get(stage_column, ([], []))
+        return LookupTableCache.interpolate(series, input_value, table_name)
+
+    @staticmethod
+    async def get_lookup_values(
+        db: Session,
+        table_name: str,
+        input_values: np.ndarray,
+        stage_column: Optional[str] = None,
+        fallback: Optional[np.ndarray] = None,
+        interpolate_stages: bool = False
+    ) -> np.ndarray:
+        """
+        Batch version of get_lookup_value for a whole sample set.
+        Inputs outside the table range take the matching `fallback` value
+        (the same per-sample fallbacks the methods used before), or raise ValueError.
+        2-D exhibits (stage columns) are served from their dense grid; with
+        interpolate_stages a stage between two chart columns is blended from both.
+        """
+        table = await LookupTableCache.load(db, table_name)
+        if stage_column is not None:
+            grid = LookupTableCache.get_grid(table_name, table)
+            if grid is not None:
+                return LookupTableCache.interpolate_grid(
+                    grid, input_values, stage_column, table_name, fallback, interpolate_stages
+                )
+        series = table.get(stage_column, ([], []))
+        return LookupTableCache.interpolate_many(series, input_values, table_name, fallback)
+
+    @staticmethod
+    def _sample_values(
+        samples: List[Dict[str, Any]],
+        key: str,
+        default: float,
+        cast=float
+    ) -> np.ndarray:
+        """Collects one measurement across all samples into a float array."""
+        return np.array([cast(sample.get(key, default)) for sample in samples], dtype=float)
+
+    @staticmethod
+    async def _resolve_factor(
+        db: Session,
+        table_name: str,
+        input_value: Optional[float],
+        stage_column: Optional[str],
+        default: float
+    ) -> Dict[str, Any]:
+        """
+        Resolves one request-level lookup for a calculation plan.
+        Falls back to `default` when the input is missing or off-chart.
+        """
+        factor = {"value": default, "source": table_name, "input": input_value, "default_used": True}
+        if input_value is None:
+            return factor
+        try:
+            factor["value"] = await CalculationService.get_lookup_value(db, table_name, input_value, stage_column)
+            factor["default_used"] = False
+        except Exception:
+            pass
+        return factor
+
+    @staticmethod
+    async def build_calculation_plan(
+        db: Session,
+        method: str,
+        growth_stage: Optional[str] = None,
+        moisture_pct: Optional[float] = None,
+        test_weight_kg_hl: Optional[float] = None,
+        quality_grade: Optional[str] = None,
+        interpolate_stages: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Works out everything that depends only on request-level inputs
+        (growth stage, moisture, test weight, quality grade) once, before the
+        sample loop: which tables apply and the scalar factors to use.
+        The plan is returned with the result so auditors can see the factors used.
+        """
+        tables: Dict[str, str] = {}
+        factors: Dict[str, Dict[str, Any]] = {}
+        stage = growth_stage or ""
+
+        if method == "stand_reduction":
+            # USDA Simplified Logic:
+            # Emergence - 10th Leaf: Exhibit 11
+            # 11th Leaf - Tassel: Exhibit 12
+            # Silked and later -> Direct 1-to-1 calculation
+            late_stages = ["11thLeaf", "12thLeaf", "13thLeaf", "14thLeaf", "15thLeaf", "16thLeaf", "tasseled"]
+            if stage in ["silked", "blister", "milk", "dough", "dent", "mature"]:
+                tables["stand"] = "direct_maturity"
+            elif stage in late_stages:
+                tables["stand"] = "exhibit12_standReduction"
+            else:
+                tables["stand"] = "exhibit11_standReduction"
+
+        elif method == "hail_damage":
+            # Stand Reduction: Ex 13 (Early) or Ex 14 (Late)
+            late_stages = ["11thLeaf", "12thLeaf", "13thLeaf", "14thLeaf", "15thLeaf", "16thLeaf", "tasseled", "silked"]
+            tables["stand"] = "exhibit14_hailStandReduction" if stage in late_stages else "exhibit13_hailStandReduction"
+            tables["defoliation"] = "exhibit15_leafLoss"
+
+        elif method == "weight_method":
+            factors["moisture_factor"] = await CalculationService._resolve_factor(
+                db, "exhibit23_moistureAdjustment", moisture_pct, "moisture_factor", 1.0
+            )
+            # Convert Test Weight to lbs/bu for lookup
+            tw_lbs_bu = test_weight_kg_hl * 0.7768 if test_weight_kg_hl is not None else None
+            factors["test_weight_factor"] = await CalculationService._resolve_factor(
+                db, "exhibit24_testWeightPack", tw_lbs_bu, "factor", 1.0
+            )
+            # DYNAMIC SHELLING FACTOR (Exhibit 17): standard 0.8 without moisture
+            factors["shelling_factor"] = await CalculationService._resolve_factor(
+                db, "exhibit17_shellingPercentage", moisture_pct or None, "factor", 0.8
+            )
+
+        elif method == "maturity_line_weight":
+            # Share of final dry matter accumulated by stage (Simplified approximations)
+            # R3 (Milk): ~45%, R4 (Dough): ~70%, R5 (Dent): ~85% unless milk line given per sample
+            development_factor = 0.5 # Default fallback
+            if stage.lower() in ['r3', 'milk']:
+                development_factor = 0.45
+            elif stage.lower() in ['r4', 'dough']:
+                development_factor = 0.70
+            elif stage.lower() in ['r5', 'dent']:
+                development_factor = 0.85
+            factors["development_factor"] = {
+                "value": development_factor, "source": "growth_stage", "input": growth_stage,
+                "default_used": development_factor == 0.5,
+                "per_sample_milk_line": stage.lower() in ['r5', 'dent']
+            }
+            # Standard Shelling 80% (Immature corn shelling is tricky, usually whole ear weight used with chart)
+            factors["shelling_factor"] = {"value": 0.8, "source": "standard", "input": None, "default_used": True}
+
+        elif method == "tonnage":
+            factors["moisture_factor"] = await CalculationService._resolve_factor(
+                db, "exhibit21_silageMoisture", moisture_pct, "factor", 1.0
+            )
+            final_grade = quality_grade.lower() if quality_grade else "fair" # Fallback
+            quality_map = {"excellent": 1.0, "good": 0.95, "fair": 0.85, "poor": 0.70}
+            factors["quality_factor"] = {
+                "value": quality_map.get(final_grade, 0.70), "source": "quality_grade",
+                "input": final_grade, "default_used": final_grade not in quality_map
+            }
+
+        else:
+            raise ValueError(f"Unknown calculation method: {method}")
+
+        return {
+            "method": method,
+            "inputs": {
+                "growth_stage": growth_stage,
+                "moisture_pct": moisture_pct,
+                "test_weight_kg_hl": test_weight_kg_hl,
+                "quality_grade": quality_grade,
+                "interpolate_stages": interpolate_stages
+            },
+            "tables": tables,
+            "factors": factors
+        }
 
     @staticmethod
     async def calculate_stand_reduction(
         db: Session,
         samples: List[Dict[str, Any]],
         growth_stage: str,
-        normal_plant_population_per_ha: int = 40000 
+        normal_plant_population_per_ha: int = 40000,
+        interpolate_stages: bool = False,
+        uncertainty: bool = False
     ) -> Dict[str, Any]:
         """
         Calculates Stand Reduction based on USDA Exhibit 11/12 logic.
@@ -123,295 +237,236 @@ class CalculationService:
             samples: List of sample dicts containing 'surviving_plants', 'length_measured_m', 'row_width_m'
             growth_stage: e.g., '7thLeaf', '10thLeaf'
             normal_plant_population_per_ha: Expected population (usually 40k-60k for maize)
+            interpolate_stages: Blend adjacent chart columns when growth_stage has none
+            uncertainty: Add bootstrap confidence intervals for loss_percentage
             
         Returns:
             Dict containing detailed calculation results and final percentage loss.
         """
         processed_samples = []
-        total_potential_pct = 0
         
         # Determine applicable table based on growth stage
-        # USDA Simplified Logic:
-        # Emergence - 10th Leaf: Exhibit 11
-        # 11th Leaf - Tassel: Exhibit 12
-        table_name = "exhibit11_standReduction"
-        late_stages = ["11thLeaf", "12thLeaf", "13thLeaf", "14thLeaf", "15thLeaf", "16thLeaf", "tasseled"]
-        
-        if growth_stage in late_stages:
-            table_name = "exhibit12_standReduction"
-            
-        # Also need to handle "Silked" and later -> Direct 1-to-1 calculation
-        is_mature = growth_stage in ["silked", "blister", "milk", "dough", "dent", "mature"]
-            
-        for sample in samples:
-            # 1. Calculate Field Plant Population (Plants/Ha) for this sample
-            # Formula: (Count / (Row Length * Row Width)) * 10000 m2/ha
-            row_len = float(sample.get('length_measured_m', 10.0))
-            row_width = float(sample.get('row_width_m', 0.9)) # Default 90cm
-            surviving = int(sample.get('surviving_plants', 0))
-            
-            sample_area_m2 = row_len * row_width
-            current_pop_per_ha = (surviving / sample_area_m2) * 10000
-            
-            # 2. Calculate Percent Stand Remaining
-            percent_stand = (current_pop_per_ha / normal_plant_population_per_ha) * 100
-            percent_stand = min(100.0, max(0.0, percent_stand)) # Cap at 0-100
-            
-            # USDA Rounding: Nearest whole percent or tenths depends on chart. 
-            # Exhibit 11 uses 5% increments originally, but we interpolate.
-            
-            # 3. Lookup Percent Potential Yield Remaining
-            if is_mature:
-                # Late stage: If 80% stand remains, potential is 80% (Direct relationship)
-                percent_potential = percent_stand
-            else:
-                try:
-                    percent_potential = await CalculationService.get_lookup_value(
-                        db, table_name, percent_stand, growth_stage
-                    )
-                except ValueError as e:
-                    # Fallback or error handling
-                    percent_potential = percent_stand # Conservative fallback
-            
+        plan = await CalculationService.build_calculation_plan(
+            db, "stand_reduction", growth_stage, interpolate_stages=interpolate_stages
+        )
+        table_name = plan["tables"]["stand"]
+        is_mature = table_name == "direct_maturity"
+            
+        # 1. Calculate Field Plant Population (Plants/Ha) for every sample
+        # Formula: (Count / (Row Length * Row Width)) * 10000 m2/ha
+        row_len = CalculationService._sample_values(samples, 'length_measured_m', 10.0)
+        row_width = CalculationService._sample_values(samples, 'row_width_m', 0.9) # Default 90cm
+        surviving = CalculationService._sample_values(samples, 'surviving_plants', 0, int)
+        
+        sample_area_m2 = row_len * row_width
+        if (sample_area_m2 == 0).any():
+            raise ValueError("Sample area (length x row width) must be greater than zero")
+        current_pop_per_ha = (surviving / sample_area_m2) * 10000
+        
+        # 2. Calculate Percent Stand Remaining
+        percent_stand = (current_pop_per_ha / normal_plant_population_per_ha) * 100
+        percent_stand = np.clip(percent_stand, 0.0, 100.0) # Cap at 0-100
+        
+        # USDA Rounding: Nearest whole percent or tenths depends on chart. 
+        # Exhibit 11 uses 5% increments originally, but we interpolate.
+        
+        # 3. Lookup Percent Potential Yield Remaining
+        if is_mature:
+            # Late stage: If 80% stand remains, potential is 80% (Direct relationship)
+            percent_potential = percent_stand
+        else:
+            # Out-of-chart values fall back to the stand % (Conservative fallback)
+            percent_potential = await CalculationService.get_lookup_values(
+                db, table_name, percent_stand, growth_stage,
+                fallback=percent_stand, interpolate_stages=interpolate_stages
+            )
+        
+        for i, sample in enumerate(samples):
             processed_samples.append({
                 "sample_number": sample.get('sample_number'),
-                "surviving_plants": surviving,
-                "current_population_ha": round(current_pop_per_ha),
-                "percent_stand": round(percent_stand, 1),
-                "percent_potential_yield": round(percent_potential, 1)
+                "surviving_plants": int(surviving[i]),
+                "current_population_ha": round(float(current_pop_per_ha[i])),
+                "percent_stand": round(float(percent_stand[i]), 1),
+                "percent_potential_yield": round(float(percent_potential[i]), 1)
             })
             
-            total_potential_pct += percent_potential
-            
         # Final Average
-        avg_potential = total_potential_pct / len(samples) if samples else 0
+        avg_potential = float(percent_potential.mean()) if samples else 0
         loss_percentage = 100.0 - avg_potential
         
-        return {
+        result = {
             "method": "stand_reduction",
             "growth_stage": growth_stage,
-            "table_used": table_name if not is_mature else "direct_maturity",
+            "table_used": table_name,
             "normal_population": normal_plant_population_per_ha,
             "average_potential_yield_pct": round(avg_potential, 2),
             "loss_percentage": round(loss_percentage, 2),
+            "calculation_plan": plan,
             "sample_details": processed_samples
         }
+        if uncertainty:
+            result["uncertainty"] = BootstrapService.intervals({"loss_percentage": 100.0 - percent_potential})
+        return result
 
     @staticmethod
     async def calculate_hail_damage(
         db: Session,
         samples: List[Dict[str, Any]],
         growth_stage: str,
-        normal_plant_population_per_ha: int = 40000
+        normal_plant_population_per_ha: int = 40000,
+        interpolate_stages: bool = False,
+        uncertainty: bool = False
     ) -> Dict[str, Any]:
         """
         Calculates Hail Damage (Stand Reduction + Defoliation + Direct).
         """
         processed_samples = []
-        total_loss_pct = 0
         
         # 1. Determine Tables
-        # Stand Reduction: Ex 13 (Early) or Ex 14 (Late)
-        stand_table = "exhibit13_hailStandReduction"
-        late_stages = ["11thLeaf", "12thLeaf", "13thLeaf", "14thLeaf", "15thLeaf", "16thLeaf", "tasseled", "silked"]
-        if growth_stage in late_stages:
-            stand_table = "exhibit14_hailStandReduction"
-            
-        defoliation_table = "exhibit15_leafLoss"
+        plan = await CalculationService.build_calculation_plan(
+            db, "hail_damage", growth_stage, interpolate_stages=interpolate_stages
+        )
+        stand_table = plan["tables"]["stand"]
+        defoliation_table = plan["tables"]["defoliation"]
+        
+        # A. Stand Reduction Loss
+        original = CalculationService._sample_values(samples, 'original_stand_count', 100, int)
+        destroyed = CalculationService._sample_values(samples, 'destroyed_plants', 0, int)
+        stand_reduction_pct = np.divide(
+            destroyed * 100, original, out=np.zeros_like(destroyed), where=original > 0
+        )
         
-        # Seed tables if needed (Safe check)
-        await CalculationService.seed_exhibit_13(db)
-        await CalculationService.seed_exhibit_14(db)
-        await CalculationService.seed_exhibit_15(db)
-
-        for sample in samples:
-            loss_components = {}
-            
-            # A. Stand Reduction Loss
-            original = int(sample.get('original_stand_count', 100))
-            destroyed = int(sample.get('destroyed_plants', 0))
-            stand_reduction_pct = (destroyed / original * 100) if original > 0 else 0
-            
-            stand_loss_yield = stand_reduction_pct # Default 1:1 fallback
-            try:
-                stand_loss_yield = await CalculationService.get_lookup_value(
-                    db, stand_table, stand_reduction_pct, growth_stage
-                )
-            except: pass
-            loss_components['stand'] = stand_loss_yield
-            
-            # B. Defoliation Loss
-            defoliation_pct = float(sample.get('percent_defoliation', 0.0))
-            defoliation_loss_yield = 0.0
-            try:
-                defoliation_loss_yield = await CalculationService.get_lookup_value(
-                    db, defoliation_table, defoliation_pct, growth_stage
-                )
-            except: 
-                # Very rough fallback if table missing
-                defoliation_loss_yield = defoliation_pct * 0.1 
-            loss_components['defoliation'] = defoliation_loss_yield
-            
-            # C. Direct Damage (Stalk, Ear, Direct)
-            # Simplified: Sum of provided directs
-            direct_pct = float(sample.get('direct_damage_pct', 0.0))
-            ear_pct = float(sample.get('ear_damage_pct', 0.0))
-            gp_pct = float(sample.get('growing_point_damage_pct', 0.0))
-            
-            direct_loss_total = direct_pct + ear_pct + gp_pct
-            loss_components['direct'] = direct_loss_total
-            
-            # Total Sample Loss (Additive, capped at 100)
-            sample_total_loss = stand_loss_yield + defoliation_loss_yield + direct_loss_total
-            sample_total_loss = min(100.0, sample_total_loss)
-            
+        # Default 1:1 fallback
+        stand_loss_yield = await CalculationService.get_lookup_values(
+            db, stand_table, stand_reduction_pct, growth_stage,
+            fallback=stand_reduction_pct, interpolate_stages=interpolate_stages
+        )
+        
+        # B. Defoliation Loss
+        defoliation_pct = CalculationService._sample_values(samples, 'percent_defoliation', 0.0)
+        # Very rough fallback if table missing
+        defoliation_loss_yield = await CalculationService.get_lookup_values(
+            db, defoliation_table, defoliation_pct, growth_stage,
+            fallback=defoliation_pct * 0.1, interpolate_stages=interpolate_stages
+        )
+        
+        # C. Direct Damage (Stalk, Ear, Direct)
+        # Simplified: Sum of provided directs
+        direct_loss_total = (
+            CalculationService._sample_values(samples, 'direct_damage_pct', 0.0)
+            + CalculationService._sample_values(samples, 'ear_damage_pct', 0.0)
+            + CalculationService._sample_values(samples, 'growing_point_damage_pct', 0.0)
+        )
+        
+        # Total Sample Loss (Additive, capped at 100)
+        sample_total_loss = np.minimum(100.0, stand_loss_yield + defoliation_loss_yield + direct_loss_total)
+        
+        for i, sample in enumerate(samples):
             processed_samples.append({
                 "sample_number": sample.get('sample_number'),
-                "stand_reduction_input": stand_reduction_pct,
-                "stand_loss_yield": stand_loss_yield,
-                "defoliation_loss_yield": defoliation_loss_yield,
-                "direct_loss_yield": direct_loss_total,
-                "total_loss_pct": round(sample_total_loss, 2)
+                "stand_reduction_input": float(stand_reduction_pct[i]),
+                "stand_loss_yield": float(stand_loss_yield[i]),
+                "defoliation_loss_yield": float(defoliation_loss_yield[i]),
+                "direct_loss_yield": float(direct_loss_total[i]),
+                "total_loss_pct": round(float(sample_total_loss[i]), 2)
             })
             
-            total_loss_pct += sample_total_loss
-            
-        avg_loss = total_loss_pct / len(samples) if samples else 0
+        avg_loss = float(sample_total_loss.mean()) if samples else 0
         avg_potential = 100.0 - avg_loss
         
-        return {
+        result = {
             "method": "hail_damage",
             "growth_stage": growth_stage,
             "loss_percentage": round(avg_loss, 2),
             "average_potential_yield_pct": round(avg_potential, 2),
+            "calculation_plan": plan,
             "sample_details": processed_samples
         }
+        if uncertainty:
+            result["uncertainty"] = BootstrapService.intervals({"loss_percentage": sample_total_loss})
+        return result
     
     @staticmethod
-    async def seed_lookup_tables(db: Session):
+    async def seed_lookup_tables(db: Session) -> List[str]:
         """
-        Seeds the database with essential USDA Exhibit 11 data for testing.
+        Seeds every registered USDA exhibit (see LookupSeeder).
+        Normally run once at startup; safe to call again.
         """
-        table_name = "exhibit11_standReduction"
-        
-        # Check if already seeded
-        existing = db.execute(select(LookupTable).where(LookupTable.table_name == table_name)).first()
-        if existing:
-            return
-            
-        data_points = []
-        
-        # Exhibit 11 Sample Data (Simplified for MVP)
-        # Columns: Emergence, ..., 10thLeaf
-        # Rows: Percent Stand 50, 55, ... 100
-        
-        stages = ["emergence", "2ndLeaf", "4thLeaf", "6thLeaf", "8thLeaf", "10thLeaf"]
-        
-        # Percent Stand -> {Stage: Potential Yield}
-        chart_data = {
-            100: {s: 100 for s in stages},
-            90:  {"emergence": 90, "2ndLeaf": 92, "4thLeaf": 94, "6thLeaf": 96, "8thLeaf": 97, "10thLeaf": 98},
-            80:  {"emergence": 80, "2ndLeaf": 84, "4thLeaf": 88, "6thLeaf": 92, "8thLeaf": 94, "10thLeaf": 96},
-            70:  {"emergence": 70, "2ndLeaf": 76, "4thLeaf": 82, "6thLeaf": 88, "8thLeaf": 91, "10thLeaf": 94},
-            60:  {"emergence": 60, "2ndLeaf": 68, "4thLeaf": 76, "6thLeaf": 84, "8thLeaf": 88, "10thLeaf": 92},
-            50:  {"emergence": 50, "2ndLeaf": 60, "4thLeaf": 70, "6thLeaf": 80, "8thLeaf": 85, "10thLeaf": 90}
-        }
-        
-        for pct_stand, stage_values in chart_data.items():
-            for stage, potential in stage_values.items():
-                data_points.append(LookupTable(
-                    table_name=table_name,
-                    input_value=float(pct_stand),
-                    stage_or_condition=stage,
-                    output_value=float(potential)
-                ))
-                
-        db.add_all(data_points)
-        db.commit()
+        return LookupSeeder.seed_all(db)
+
     @staticmethod
     async def calculate_weight_method(
         db: Session,
         samples: List[Dict[str, Any]],
         row_width_m: float = 0.76, 
         moisture_pct: float = None,
-        test_weight_kg_hl: float = None 
+        test_weight_kg_hl: float = None,
+        uncertainty: bool = False
     ) -> Dict[str, Any]:
         """
         Calculates Yield using Weight Method. Metric Version.
+        With uncertainty=True adds bootstrap confidence intervals for avg_yield_kg_ha.
         """
         processed_samples = []
-        total_kg_ha = 0
-        
-        exhibit23 = "exhibit23_moistureAdjustment"
-        exhibit24 = "exhibit24_testWeightPack"
-        
-        moisture_factor = 1.0
-        if moisture_pct is not None:
-             try:
-                 moisture_factor = await CalculationService.get_lookup_value(db, exhibit23, moisture_pct, "moisture_factor")
-             except: pass
-             
-        test_weight_factor = 1.0
-        # Convert Test Weight to lbs/bu for lookup
-        if test_weight_kg_hl is not None:
-            tw_lbs_bu = test_weight_kg_hl * 0.7768
-            try:
-                test_weight_factor = await CalculationService.get_lookup_value(db, exhibit24, tw_lbs_bu, "factor")
-            except: pass
+        
+        # Moisture, test weight and shelling factors are request-level:
+        # resolve them once rather than per sample
+        plan = await CalculationService.build_calculation_plan(
+            db, "weight_method", moisture_pct=moisture_pct, test_weight_kg_hl=test_weight_kg_hl
+        )
+        moisture_factor = plan["factors"]["moisture_factor"]["value"]
+        test_weight_factor = plan["factors"]["test_weight_factor"]["value"]
+        shelling_factor = plan["factors"]["shelling_factor"]["value"]
 
-        for sample in samples:
-            weight_kg = float(sample.get('fresh_weight_kg', 0.0))
-            # Convert weight to lbs
-            weight_lbs = CalculationService.to_lbs(weight_kg)
-            
-            # Area usually m2 now?
-            area_m2 = float(sample.get('sample_area_m2', 40.46)) # 1/100 acre in m2 approx
-            # Convert area to acres
-            area_acres = area_m2 / 4046.86
-            
-            # DYNAMIC SHELLING FACTOR (Exhibit 17)
-            # Use moisture_pct if available, else standard 0.8
-            shelling_factor = 0.8
-            if moisture_pct:
-                 try:
-                     shelling_factor = await CalculationService.get_lookup_value(db, "exhibit17_shellingPercentage", moisture_pct, "shelling_factor")
-                 except: pass # Default 0.8
-            
-            shelled_weight = weight_lbs * shelling_factor
-            
-            bushels_sample = shelled_weight / 56.0
-            bushels_per_acre_raw = bushels_sample / area_acres
-            
-            # Apply Factors
-            bushels_adjusted = bushels_per_acre_raw * moisture_factor * test_weight_factor
-            
-            foreign_mat = float(sample.get('foreign_material_pct', 0.0)) / 100.0
-            damaged_ker = float(sample.get('damaged_kernels_pct', 0.0)) / 100.0
-            broken_ker = float(sample.get('broken_kernels_pct', 0.0)) / 100.0
-            heat_dmg = float(sample.get('heat_damage_pct', 0.0)) / 100.0
-            
-            total_deduction_pct = foreign_mat + damaged_ker + broken_ker + heat_dmg
-            bushels_final = bushels_adjusted * (1.0 - total_deduction_pct)
-            
-            # Convert Result to kg/ha
-            yield_kg_ha = CalculationService.bu_acre_to_kg_ha(bushels_final)
-            
+        weight_kg = CalculationService._sample_values(samples, 'fresh_weight_kg', 0.0)
+        # Convert weight to lbs
+        weight_lbs = CalculationService.to_lbs(weight_kg)
+        
+        # Area usually m2 now?
+        area_m2 = CalculationService._sample_values(samples, 'sample_area_m2', 40.46) # 1/100 acre in m2 approx
+        if (area_m2 == 0).any():
+            raise ValueError("Sample area must be greater than zero")
+        # Convert area to acres
+        area_acres = area_m2 / 4046.86
+        
+        shelled_weight = weight_lbs * shelling_factor
+        
+        bushels_sample = shelled_weight / 56.0
+        bushels_per_acre_raw = bushels_sample / area_acres
+        
+        # Apply Factors
+        bushels_adjusted = bushels_per_acre_raw * moisture_factor * test_weight_factor
+        
+        total_deduction_pct = (
+            CalculationService._sample_values(samples, 'foreign_material_pct', 0.0)
+            + CalculationService._sample_values(samples, 'damaged_kernels_pct', 0.0)
+            + CalculationService._sample_values(samples, 'broken_kernels_pct', 0.0)
+            + CalculationService._sample_values(samples, 'heat_damage_pct', 0.0)
+        ) / 100.0
+        bushels_final = bushels_adjusted * (1.0 - total_deduction_pct)
+        
+        # Convert Result to kg/ha
+        yield_kg_ha = CalculationService.bu_acre_to_kg_ha(bushels_final)
+        
+        for i, sample in enumerate(samples):
             processed_samples.append({
                 "sample_number": sample.get('sample_number'),
-                "yield_kg_ha_adj": round(yield_kg_ha, 1)
+                "yield_kg_ha_adj": round(float(yield_kg_ha[i]), 1)
             })
             
-            total_kg_ha += yield_kg_ha
-            
-        avg_yield = total_kg_ha / len(samples) if samples else 0
+        avg_yield = float(yield_kg_ha.mean()) if samples else 0
         
-        return {
+        result = {
             "method": "weight_method",
             "avg_yield_kg_ha": round(avg_yield, 1),
             "moisture_factor": moisture_factor,
             "test_weight_factor": test_weight_factor,
+            "calculation_plan": plan,
             "sample_details": processed_samples
         }
+        if uncertainty:
+            result["uncertainty"] = BootstrapService.intervals({"avg_yield_kg_ha": yield_kg_ha})
+        return result
 
     @staticmethod
     async def calculate_maturity_line_weight(
@@ -433,6 +488,9 @@ class CalculationService:
         # R5 (Dent): ~85-95%
         # Or better: use maturity line percentage directly if provided.
         # Formula: Current Weight / Development % = Projected Final Weight
+        plan = await CalculationService.build_calculation_plan(db, "maturity_line_weight", growth_stage)
+        stage_development = plan["factors"]["development_factor"]
+        shelling_factor = plan["factors"]["shelling_factor"]["value"]
         
         for sample in samples:
             weight_lbs = float(sample.get('weight_lbs', 0.0))
@@ -440,34 +498,20 @@ class CalculationService:
             maturity_pct = float(sample.get('maturity_line_position', 0.0)) # 0-100%
             
             # Estimate % of final dry matter accumulated
-            # USDA logic: relate milk line to dry matter accumulation
-            # 0% milk line (R5 start) -> ~0% hard starch ?? No, Milk Line moves DOWN.
-            # 0% down (tip) = Start of R5
-            # 50% down = 95% yield accumulated? No, 50% line = 95% yield?
             # USDA Rule of Thumb:
             # Milk Stage (R3): 40% of final yield
             # Late Dough (R4): 65% of final yield
             # 1/2 Milk Line: 95% of final yield ??
             # Let's use a simplified linear model or stage based factor for MVP.
-            
-            development_factor = 0.5 # Default fallback
-            if growth_stage.lower() in ['r3', 'milk']: 
-                development_factor = 0.45
-            elif growth_stage.lower() in ['r4', 'dough']: 
-                development_factor = 0.70
-            elif growth_stage.lower() in ['r5', 'dent']:
+            development_factor = stage_development["value"]
+            if stage_development["per_sample_milk_line"] and maturity_pct > 0:
                 # Use milk line if available
-                if maturity_pct > 0:
-                    # 50% line -> ~90-95% weight
-                    # 25% line -> ~80% weight
-                    development_factor = 0.75 + (maturity_pct / 100.0) * 0.25
-                else:
-                    development_factor = 0.85
+                # 50% line -> ~90-95% weight
+                # 25% line -> ~80% weight
+                development_factor = 0.75 + (maturity_pct / 100.0) * 0.25
                     
             projected_weight = weight_lbs / development_factor if development_factor > 0 else 0
             
-            # Standard Shelling 80% (Immature corn shelling is tricky, usually whole ear weight used with chart)
-            shelling_factor = 0.8
             shelled_weight = projected_weight * shelling_factor
             
             bushels_sample = shelled_weight / 56.0
@@ -491,6 +535,7 @@ class CalculationService:
             "avg_maturity_line_position": sum(s['maturity_line_pct'] for s in processed_samples) / len(processed_samples) if processed_samples else 0,
             "projected_yield_bu_acre": round(avg_yield, 1),
             "current_development_pct": round(sum(s['development_factor_used'] for s in processed_samples) / len(processed_samples) * 100, 1) if processed_samples else 0,
+            "calculation_plan": plan,
             "sample_details": processed_samples
         }
 
@@ -508,21 +553,13 @@ class CalculationService:
         processed_samples = []
         total_tonnes_ha = 0
         
-        table_name = "exhibit21_silageMoisture"
-        await CalculationService.seed_exhibit_21(db)
-        
-        final_grade = quality_grade.lower() if quality_grade else "fair"
-        if not quality_grade:
-             # Auto logic... (keep existing if needed, simplified here)
-             final_grade = "fair" # Fallback
-
-        quality_map = {"excellent": 1.0, "good": 0.95, "fair": 0.85, "poor": 0.70}
-        quality_factor = quality_map.get(final_grade, 0.70)
-        
-        moisture_factor = 1.0
-        try:
-             moisture_factor = await CalculationService.get_lookup_value(db, table_name, moisture_pct, "factor")
-        except: pass
+        # Moisture and quality factors apply to the whole field
+        plan = await CalculationService.build_calculation_plan(
+            db, "tonnage", moisture_pct=moisture_pct, quality_grade=quality_grade
+        )
+        moisture_factor = plan["factors"]["moisture_factor"]["value"]
+        quality_factor = plan["factors"]["quality_factor"]["value"]
+        final_grade = plan["factors"]["quality_factor"]["input"]
         
         for sample in samples:
             weight_kg = float(sample.get('fresh_weight_kg', 0.0))
@@ -552,6 +589,7 @@ class CalculationService:
             "method": "tonnage",
             "tonnes_per_ha": round(avg_tonnes, 1),
             "quality_grade": final_grade,
+            "calculation_plan": plan,
             "sample_details": processed_samples
         }
 
@@ -659,139 +697,3 @@ class CalculationService:
             "standard_equivalent_days": int(standard_days_equiv),
             "lookup_table_stage": lookup_stage
         }
-
-    # --- Seeding Helpers (Additional) ---
-    
-    @staticmethod
-    async def seed_exhibit_21(db: Session):
-        table_name = "exhibit21_silageMoisture"
-        existing = db.execute(select(LookupTable).where(LookupTable.table_name == table_name)).first()
-        if existing: return
-        
-        # Silage Moisture Factors (Standard 65%)
-        # >65% reduces tonnage (water weight)
-        # <65% increases tonnage (dryer than standard)
-        # Factor = 35 / (100 - Actual %) ??? No, usually (100-Actual)/(100-Standard)
-        # Let's use a simplified table
-        data = [
-            (50.0, 1.4), (55.0, 1.25), (60.0, 1.15), (65.0, 1.0),
-            (70.0, 0.9), (75.0, 0.8), (80.0, 0.7)
-        ]
-        for m, f in data:
-            db.add(LookupTable(table_name=table_name, input_value=m, stage_or_condition="factor", output_value=f))
-        db.commit()
-    
-    @staticmethod
-    async def seed_exhibit_17(db: Session):
-        table_name = "exhibit17_shellingPercentage"
-        existing = db.execute(select(LookupTable).where(LookupTable.table_name == table_name)).first()
-        if existing: return
-        
-        # Exhibit 17: Shelling Percentage based on Moisture
-        # High moisture = lower shelling % (cob is heavier/wetter)
-        # USDA typical range: 80% (0.80) at standard 15.5%. Lower at high moisture.
-        # Approximation data:
-        # Moisture % -> Shelling Factor
-        data = [
-            (10.0, 0.82), (15.0, 0.80), (20.0, 0.78),
-            (25.0, 0.76), (30.0, 0.74), (35.0, 0.72), (40.0, 0.70)
-        ]
-        for m, f in data:
-            db.add(LookupTable(table_name=table_name, input_value=m, stage_or_condition="factor", output_value=f))
-        db.commit()
-
-    @staticmethod
-    async def seed_exhibit_23(db: Session):
-        table_name = "exhibit23_moistureAdjustment"
-        existing = db.execute(select(LookupTable).where(LookupTable.table_name == table_name)).first()
-        if existing: return
-        
-        # USDA Moisture Adjustment Factor = (100 - Actual) / (100 - Standard)
-        # Standard Corn Basis = 15.0%
-        # Example: 20% moisture -> (100-20)/(100-15) = 80/85 = 0.9412
-        # Example: 15% moisture -> 1.0
-        # Example: 30% moisture -> 70/85 = 0.8235
-        data = [
-            (10.0, 1.0588), (15.0, 1.0000), (20.0, 0.9412),
-            (25.0, 0.8824), (30.0, 0.8235), (35.0, 0.7647)
-        ]
-        for m, f in data:
-             db.add(LookupTable(table_name=table_name, input_value=m, stage_or_condition="moisture_factor", output_value=f))
-        db.commit()
-
-    @staticmethod
-    async def seed_exhibit_24(db: Session):
-        table_name = "exhibit24_testWeightPack"
-        existing = db.execute(select(LookupTable).where(LookupTable.table_name == table_name)).first()
-        if existing: return
-        
-        # Test Weight Factors (Lbs/Bu)
-        # USDA Standards: 56 lbs = 1.0
-        # Lower weights reduce yield: 54->0.98, 50->0.94, etc.
-        data = [
-            (56.0, 1.0), (55.0, 0.99), (54.0, 0.98), (53.0, 0.97), 
-            (52.0, 0.96), (51.0, 0.95), (50.0, 0.94), (49.0, 0.93),
-            (48.0, 0.92), (47.0, 0.91), (46.0, 0.90), (45.0, 0.89)
-        ]
-        for w, f in data:
-             db.add(LookupTable(table_name=table_name, input_value=w, stage_or_condition="factor", output_value=f))
-        db.commit()
-    
-    @staticmethod
-    async def seed_exhibit_13(db: Session):
-        table_name = "exhibit13_hailStandReduction"
-        existing = db.execute(select(LookupTable).where(LookupTable.table_name == table_name)).first()
-        if existing: return
-        
-        # Simplified Data: 7th to 10th leaf
-        # Input: Percent Stand Reduction -> Output: Percent Damage
-        # Example: 10% reduction -> 3% damage (plants recover)
-        stages = ["7thLeaf", "8thLeaf", "9thLeaf", "10thLeaf"]
-        chart_data = {
-            10: {s: 3.0 for s in stages}, 
-            50: {s: 48.0 for s in stages}, # Almost 1:1 at high loss
-            100: {s: 100.0 for s in stages}
-        }
-        for inp, vals in chart_data.items():
-            for s, out in vals.items():
-                db.add(LookupTable(table_name=table_name, input_value=float(inp), stage_or_condition=s, output_value=float(out)))
-        db.commit()
-
-    @staticmethod
-    async def seed_exhibit_14(db: Session):
-        table_name = "exhibit14_hailStandReduction"
-        existing = db.execute(select(LookupTable).where(LookupTable.table_name == table_name)).first()
-        if existing: return
-        
-        # 11th Leaf to Tassel: Usually nearly 1-to-1 damage
-        stages = ["11thLeaf", "15thLeaf", "tasseled"]
-        chart_data = {
-            10: {s: 9.0 for s in stages}, 
-            50: {s: 50.0 for s in stages}, 
-            100: {s: 100.0 for s in stages}
-        }
-        for inp, vals in chart_data.items():
-            for s, out in vals.items():
-                db.add(LookupTable(table_name=table_name, input_value=float(inp), stage_or_condition=s, output_value=float(out)))
-        db.commit()
-
-    @staticmethod
-    async def seed_exhibit_15(db: Session):
-        table_name = "exhibit15_leafLoss"
-        existing = db.execute(select(LookupTable).where(LookupTable.table_name == table_name)).first()
-        if existing: return
-        
-        # Leaf Loss (Defoliation)
-        # Input: % Defoliation -> Output: % Yield Loss
-        # Varies heavily by stage. Tassel stage is most critical.
-        data = [
-            # 7th Leaf: 100% de-foliation = 9% yield loss
-            (100.0, "7thLeaf", 9.0), (50.0, "7thLeaf", 4.0),
-            # 10th Leaf: 100% = 16% loss
-            (100.0, "10thLeaf", 16.0), (50.0, "10thLeaf", 7.0),
-            # Tasseled: 100% = 100% loss (Critical)
-            (100.0, "tasseled", 100.0), (50.0, "tasseled", 32.0),
-        ]
-        for inp, s, out in data:
-            db.add(LookupTable(table_name=table_name, input_value=inp, stage_or_condition=s, output_value=out))
-        db.commit()
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import hashlib
+import threading
+
+import numpy as np
+import shapely
+from geoalchemy2.shape import to_shape
+from shapely import wkt
+from shapely.geometry import Point
+from shapely.ops import transform
+
+from app.core.config import settings
+from app.services.sampling import FieldGeometry, LocalProjection, TO_WEB_MERCATOR
+
+# Edge-buffered interiors kept per field (one per distinct edge_buffer_meters)
+_MAX_INTERIORS = 4
+
+
+class PreparedField:
+    """
+    A field boundary parsed once, with what sampling, check-in and GPS
+    validation derive from it: a prepared containment predicate, the local
+    metric projection, the EPSG:3857 edge and the edge-buffered interiors.
+    """
+
+    def __init__(self, boundary):
+        self.boundary = boundary
+        # Identifies this exact boundary (sampling plans key on it)
+        self.boundary_hash = hashlib.sha256(shapely.to_wkb(boundary)).hexdigest()
+        shapely.prepare(self.boundary)
+        self.projection = LocalProjection(boundary.bounds)
+
+        # Local metres, for distances to the boundary
+        self.local = transform(self.projection.to_xy, boundary)
+        # Edge in web mercator metres, for sample distance_from_edge_meters
+        self.edge_3857 = transform(TO_WEB_MERCATOR.transform, boundary.boundary)
+
+        self._interiors: "OrderedDict[float, FieldGeometry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def interior(self, edge_buffer_meters: float) -> FieldGeometry:
+        """Sampling geometry for an edge buffer, built on first use."""
+        key = round(float(edge_buffer_meters), 2)
+        with self._lock:
+            geometry = self._interiors.get(key)
+        if geometry is not None:
+            return geometry
+
+        geometry = FieldGeometry(self.boundary, key)
+        with self._lock:
+            self._interiors[key] = geometry
+            while len(self._interiors) > _MAX_INTERIORS:
+                self._interiors.popitem(last=False)
+        return geometry
+
+    def contains(self, lat: float, lng: float) -> bool:
+        return bool(shapely.contains_xy(self.boundary, lng, lat))
+
+    def contains_many(self, lats, lngs) -> np.ndarray:
+        return shapely.contains_xy(self.boundary, np.asarray(lngs, dtype=float), np.asarray(lats, dtype=float))
+
+    def distance_to_boundary_m(self, lat: float, lng: float) -> float:
+        """Distance in metres from a GPS point to the field edge (inside or out)."""
+        x, y = self.projection.to_xy(lng, lat)
+        return float(self.local.boundary.distance(Point(x, y)))
+
+
+class FieldGeometryCache:
+    """
+    Process-wide LRU of PreparedField keyed by field id.
+    Each entry remembers the field's updated_at; a field loaded with a newer
+    version rebuilds its entry, and writers call invalidate() explicitly.
+    """
+
+    _entries: "OrderedDict[Any, Tuple[Any, PreparedField]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    max_entries = settings.FIELD_GEOMETRY_CACHE_SIZE
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def _version(field) -> Any:
+        return field.updated_at or field.created_at
+
+    @classmethod
+    def get(cls, field) -> PreparedField:
+        """
+        PreparedField for a Field ORM row. The boundary is parsed from the
+        already-loaded column (WKB, or WKT before a refresh), so no extra query.
+        """
+        version = cls._version(field)
+        with cls._lock:
+            entry = cls._entries.get(field.id)
+            if entry is not None and entry[0] == version:
+                cls._entries.move_to_end(field.id)
+                cls.hits += 1
+                return entry[1]
+            cls.misses += 1
+
+        boundary = field.field_boundary
+        prepared = PreparedField(wkt.loads(boundary) if isinstance(boundary, str) else to_shape(boundary))
+
+        if cls.max_entries > 0:
+            with cls._lock:
+                cls._entries[field.id] = (version, prepared)
+                cls._entries.move_to_end(field.id)
+                while len(cls._entries) > cls.max_entries:
+                    cls._entries.popitem(last=False)
+        return prepared
+
+    @classmethod
+    def invalidate(cls, field_id: Optional[Any] = None):
+        """Drops one field (after a boundary edit) or everything."""
+        with cls._lock:
+            if field_id is None:
+                cls._entries.clear()
+            else:
+                cls._entries.pop(field_id, None)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        total = cls.hits + cls.misses
+        return {
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "hit_rate": round(cls.hits / total, 4) if total else 0.0,
+            "entries": len(cls._entries),
+            "max_entries": cls.max_entries
+        }
@@ -0,0 +1,201 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Dict, Any, Optional, Iterator
+from dataclasses import dataclass
+from uuid import UUID
+import io
+import json
+import uuid
+import zipfile
+
+import shapefile
+import shapely
+from pyproj import CRS, Transformer
+from shapely.geometry import shape
+from shapely.ops import transform
+
+from app.db.session import SessionLocal
+from app.models.spatial import Field
+from app.services.field_index import FieldIndex
+from app.services.geodesy import geodesic_areas_m2
+from app.services.spatial import SpatialService, VerisSpatialError
+
+# Fields inserted per executemany round trip / commit
+IMPORT_CHUNK_SIZE = 1000
+
+_WGS84 = CRS.from_epsg(4326)
+
+
+class FieldImportError(Exception):
+    pass
+
+
+@dataclass
+class ImportFeature:
+    index: int
+    properties: Dict[str, Any]
+    geometry: Optional[Any] = None  # lon/lat shapely geometry
+    error: Optional[str] = None
+
+
+class FieldImportService:
+    """
+    Bulk field onboarding from a GeoJSON FeatureCollection or a zipped shapefile.
+    Boundaries are validated and measured in-process (measure_field_polygon)
+    and inserted in chunks with one executemany per chunk; results are
+    yielded per feature as NDJSON lines.
+    """
+
+    @staticmethod
+    def read_features(filename: str, data: bytes) -> List[ImportFeature]:
+        """Parses an upload by content: zip archives as shapefiles, anything else as GeoJSON."""
+        if data[:4] == b"PK\x03\x04" or (filename or "").lower().endswith(".zip"):
+            return FieldImportService._read_shapefile(data)
+        return FieldImportService._read_geojson(data)
+
+    @staticmethod
+    def _read_geojson(data: bytes) -> List[ImportFeature]:
+        try:
+            collection = json.loads(data)
+        except ValueError as e:
+            raise FieldImportError(f"Invalid GeoJSON: {str(e)}")
+        if not isinstance(collection, dict) or collection.get("type") != "FeatureCollection":
+            raise FieldImportError("Expected a GeoJSON FeatureCollection")
+
+        features = []
+        for i, feature in enumerate(collection.get("features") or []):
+            properties = dict(feature.get("properties") or {})
+            if feature.get("id") is not None:
+                properties.setdefault("id", feature["id"])
+            features.append(FieldImportService._feature(i, properties, feature.get("geometry")))
+        return features
+
+    @staticmethod
+    def _read_shapefile(data: bytes) -> List[ImportFeature]:
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(data))
+        except zipfile.BadZipFile:
+            raise FieldImportError("Invalid zip archive")
+
+        members = {name.lower().rsplit(".", 1)[-1]: name for name in archive.namelist()
+                   if not name.startswith("__MACOSX")}
+        if "shp" not in members or "dbf" not in members:
+            raise FieldImportError("Zip must contain a .shp and .dbf")
+
+        # Reproject to WGS84 when the .prj says otherwise
+        to_wgs84 = None
+        if "prj" in members:
+            crs = CRS.from_wkt(archive.read(members["prj"]).decode("utf-8", "ignore"))
+            if not crs.equals(_WGS84, ignore_axis_order=True):
+                to_wgs84 = Transformer.from_crs(crs, _WGS84, always_xy=True).transform
+
+        reader = shapefile.Reader(
+            shp=io.BytesIO(archive.read(members["shp"])),
+            dbf=io.BytesIO(archive.read(members["dbf"])),
+            shx=io.BytesIO(archive.read(members["shx"])) if "shx" in members else None
+        )
+        features = []
+        for i, record in enumerate(reader.iterShapeRecords()):
+            feature = FieldImportService._feature(i, record.record.as_dict(), record.shape.__geo_interface__)
+            if feature.geometry is not None and to_wgs84 is not None:
+                feature.geometry = transform(to_wgs84, feature.geometry)
+            features.append(feature)
+        return features
+
+    @staticmethod
+    def _feature(index: int, properties: Dict[str, Any], geometry: Optional[Dict[str, Any]]) -> ImportFeature:
+        if not geometry:
+            return ImportFeature(index, properties, error="Feature has no geometry")
+        try:
+            geom = shapely.force_2d(shape(geometry))
+        except Exception as e:
+            return ImportFeature(index, properties, error=f"Unreadable geometry: {str(e)}")
+
+        # Fields are single polygons; a one-part MultiPolygon is accepted
+        if geom.geom_type == "MultiPolygon" and len(geom.geoms) == 1:
+            geom = geom.geoms[0]
+        if geom.geom_type != "Polygon":
+            return ImportFeature(index, properties, error=f"Unsupported geometry type: {geom.geom_type}")
+        return ImportFeature(index, properties, geometry=geom)
+
+    @staticmethod
+    def import_features(farm_id: UUID, features: List[ImportFeature],
+                        code_property: str = "field_code",
+                        name_property: str = "field_name",
+                        tenant_id: Optional[UUID] = None) -> Iterator[str]:
+        """
+        Validates, measures and inserts features chunk by chunk, yielding one
+        JSON line per feature and a final summary line. Runs on its own session
+        since it is consumed by a StreamingResponse after the endpoint returns.
+        tenant_id, when given, has its check-in field index refreshed per chunk.
+        """
+        db = SessionLocal()
+        created = failed = 0
+        try:
+            existing = set(db.execute(select(Field.field_code).where(Field.farm_id == farm_id)).scalars())
+
+            for start in range(0, len(features), IMPORT_CHUNK_SIZE):
+                chunk = features[start:start + IMPORT_CHUNK_SIZE]
+                # One vectorized geodesic area pass per chunk
+                areas = geodesic_areas_m2([f.geometry for f in chunk])
+                rows = []
+                results = []
+                for feature, area_m2 in zip(chunk, areas):
+                    code = feature.properties.get(code_property) or feature.properties.get("id")
+                    code = str(code)[:50] if code is not None else f"IMPORT-{feature.index + 1}"
+                    result = {"feature": feature.index, "field_code": code}
+                    results.append(result)
+
+                    if feature.error:
+                        result["error"] = feature.error
+                        continue
+                    if code in existing:
+                        result["error"] = "Field code already exists on this farm"
+                        continue
+                    try:
+                        metrics = SpatialService.measure_field_polygon(feature.geometry, area_m2=float(area_m2))
+                    except VerisSpatialError as e:
+                        result["error"] = str(e)
+                        continue
+
+                    existing.add(code)
+                    field_id = uuid.uuid4()
+                    result.update({"field_id": str(field_id), "area_hectares": metrics["area_hectares"]})
+                    rows.append({
+                        "id": field_id,
+                        "farm_id": farm_id,
+                        "field_code": code,
+                        "field_name": feature.properties.get(name_property),
+                        "field_boundary": metrics["boundary_wkt"],
+                        "boundary_medium": metrics["boundary_levels"]["medium"],
+                        "boundary_low": metrics["boundary_levels"]["low"],
+                        "field_area": metrics["area_hectares"],
+                        "field_center": f"POINT({metrics['center_lng']} {metrics['center_lat']})"
+                    })
+
+                if rows:
+                    # A code taken concurrently is skipped rather than failing the chunk
+                    inserted = set(db.execute(
+                        insert(Field)
+                        .on_conflict_do_nothing(constraint="unique_farm_field_code")
+                        .returning(Field.id),
+                        rows
+                    ).scalars())
+                    db.commit()
+                    if tenant_id is not None:
+                        FieldIndex.touch(tenant_id)
+                    for result in results:
+                        if "field_id" in result and UUID(result["field_id"]) not in inserted:
+                            result.pop("field_id")
+                            result["error"] = "Field code already exists on this farm"
+
+                for result in results:
+                    if "error" in result:
+                        failed += 1
+                    else:
+                        created += 1
+                    yield json.dumps(result) + "\n"
+
+            yield json.dumps({"summary": {"total": len(features), "created": created, "failed": failed}}) + "\n"
+        finally:
+            db.close()
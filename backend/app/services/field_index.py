@@ -0,0 +1,158 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from typing import List, Dict, Any, Optional
+from datetime import timedelta
+import threading
+import time
+
+import shapely
+from shapely.strtree import STRtree
+
+from app.core.config import settings
+from app.db.session import run_in_db_pool
+from app.models.spatial import Farm, Field
+
+# Rows re-read behind the watermark, for transactions that commit late
+_WATERMARK_LAG = timedelta(seconds=60)
+
+
+class _TenantIndex:
+    """
+    STR R-tree over one tenant's field boundaries (lon/lat), plus a small
+    delta of fields added or changed since the tree was built.
+    """
+
+    def __init__(self, rows):
+        self.ids = [row.id for row in rows]
+        self.info = [{"field_id": str(row.id), "field_code": row.field_code, "field_name": row.field_name}
+                     for row in rows]
+        self.tree = STRtree(shapely.from_wkb([row.boundary for row in rows]))
+        self.positions = {field_id: i for i, field_id in enumerate(self.ids)}
+        # Tree entries superseded by the delta
+        self.stale = set()
+        self.delta: Dict[Any, tuple] = {}
+        # (R-tree over the delta, its infos, stale) swapped as one reference in apply()
+        self.view = (None, [], self.stale)
+        self.versions = {row.id: row.version for row in rows}
+        self.watermark = max((row.version for row in rows), default=None)
+        self.checked_at = time.monotonic()
+        self.dirty = False
+
+    def apply(self, rows):
+        # Copy-and-swap so concurrent locate() calls never see a half-applied delta
+        delta, stale = dict(self.delta), set(self.stale)
+        for row in rows:
+            if self.versions.get(row.id) == row.version:
+                continue
+            boundary = shapely.from_wkb(row.boundary)
+            if row.id in self.positions:
+                stale.add(self.positions[row.id])
+            delta[row.id] = (boundary, {
+                "field_id": str(row.id), "field_code": row.field_code, "field_name": row.field_name
+            })
+            self.versions[row.id] = row.version
+            self.watermark = max(self.watermark, row.version) if self.watermark else row.version
+        entries = list(delta.values())
+        delta_tree = STRtree([boundary for boundary, _ in entries]) if entries else None
+        self.delta, self.stale = delta, stale
+        self.view = (delta_tree, [info for _, info in entries], stale)
+        self.checked_at = time.monotonic()
+        self.dirty = False
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return len(self.delta) > max(256, len(self.ids) // 10)
+
+    @property
+    def needs_refresh(self) -> bool:
+        return self.dirty or time.monotonic() - self.checked_at > settings.FIELD_INDEX_REFRESH_SECONDS
+
+    def locate(self, lat: float, lng: float) -> Optional[Dict[str, Any]]:
+        point = shapely.points(lng, lat)
+        delta_tree, delta_info, stale = self.view
+        if delta_tree is not None:
+            for i in delta_tree.query(point, predicate="intersects"):
+                return delta_info[i]
+        for i in self.tree.query(point, predicate="intersects"):
+            if i not in stale:
+                return self.info[i]
+        return None
+
+
+class FieldIndex:
+    """
+    Per-tenant "which field am I standing in" lookups.
+    Each tenant's index is built lazily on first use (one query, on the DB
+    pool), then refreshed incrementally from fields whose created_at /
+    updated_at moved past its watermark: every FIELD_INDEX_REFRESH_SECONDS,
+    or on the next lookup after touch(). Lookups are in-memory R-tree queries.
+    """
+
+    _tenants: Dict[Any, _TenantIndex] = {}
+    _build_locks: Dict[Any, threading.Lock] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _rows(db: Session, tenant_id, since=None) -> List[Any]:
+        version = func.coalesce(Field.updated_at, Field.created_at)
+        query = (
+            select(
+                Field.id,
+                Field.field_code,
+                Field.field_name,
+                func.ST_AsBinary(Field.field_boundary).label("boundary"),
+                version.label("version")
+            )
+            .join(Farm, Field.farm_id == Farm.id)
+            .where(Farm.tenant_id == tenant_id, Field.field_boundary.isnot(None))
+        )
+        if since is not None:
+            query = query.where(version >= since - _WATERMARK_LAG)
+        return db.execute(query).all()
+
+    @classmethod
+    def _refresh(cls, db: Session, tenant_id) -> _TenantIndex:
+        # Per-tenant lock: one tenant's rebuild doesn't hold up the others
+        with cls._lock:
+            build_lock = cls._build_locks.setdefault(tenant_id, threading.Lock())
+
+        with build_lock:
+            index = cls._tenants.get(tenant_id)
+            if index is not None and not index.needs_refresh:
+                return index
+
+            if index is not None and index.watermark is not None:
+                index.apply(cls._rows(db, tenant_id, since=index.watermark))
+                if not index.needs_rebuild:
+                    return index
+
+            index = _TenantIndex(cls._rows(db, tenant_id))
+            with cls._lock:
+                cls._tenants[tenant_id] = index
+            return index
+
+    @classmethod
+    async def locate(cls, db: Session, tenant_id, lat: float, lng: float) -> Optional[Dict[str, Any]]:
+        """
+        The tenant field containing (lat, lng), as field_id / field_code /
+        field_name, or None. Index (re)loads run on the DB thread pool.
+        """
+        index = cls._tenants.get(tenant_id)
+        if index is None or index.needs_refresh:
+            index = await run_in_db_pool(cls._refresh, db, tenant_id)
+        return index.locate(lat, lng)
+
+    @classmethod
+    def touch(cls, tenant_id):
+        """Marks a tenant's index for refresh after its fields were written."""
+        index = cls._tenants.get(tenant_id)
+        if index is not None:
+            index.dirty = True
+
+    @classmethod
+    def invalidate(cls, tenant_id=None):
+        with cls._lock:
+            if tenant_id is None:
+                cls._tenants.clear()
+            else:
+                cls._tenants.pop(tenant_id, None)
@@ -0,0 +1,68 @@
+from typing import Sequence
+import math
+
+import numpy as np
+import shapely
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+_E2 = WGS84_F * (2 - WGS84_F)
+_E = math.sqrt(_E2)
+
+
+def _q(sin_lat: np.ndarray) -> np.ndarray:
+    # Authalic "q" function of the ellipsoid (Snyder, Map Projections, eq. 3-12)
+    e_sin = _E * sin_lat
+    return (1 - _E2) * (sin_lat / (1 - e_sin ** 2) - np.log((1 - e_sin) / (1 + e_sin)) / (2 * _E))
+
+
+_QP = float(_q(np.array(1.0)))
+# Radius of the sphere with the ellipsoid's surface area
+AUTHALIC_RADIUS_M = WGS84_A * math.sqrt(_QP / 2)
+
+
+def geodesic_areas_m2(geometries: Sequence) -> np.ndarray:
+    """
+    Ellipsoidal (WGS84) area in square metres of many lon/lat (Multi)Polygons
+    at once; holes are subtracted and non-polygonal geometries give 0.
+
+    Latitudes are mapped to authalic latitude, which carries the ellipsoid
+    equal-area onto a sphere of AUTHALIC_RADIUS_M, and each ring's spherical
+    excess is summed edge by edge in one NumPy pass over all rings.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    areas = np.zeros(len(geometries))
+    if len(geometries) == 0:
+        return areas
+
+    parts, part_owner = shapely.get_parts(geometries, return_index=True)
+    polygons = shapely.get_type_id(parts) == 3
+    parts, part_owner = parts[polygons], part_owner[polygons]
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    if len(rings) == 0:
+        return areas
+
+    coords, vertex_ring = shapely.get_coordinates(rings, return_index=True)
+    lng = np.radians(coords[:, 0])
+    sin_beta = np.clip(_q(np.sin(np.radians(coords[:, 1]))) / _QP, -1.0, 1.0)
+
+    # Edges join consecutive vertices of the same (closed) ring
+    same_ring = vertex_ring[1:] == vertex_ring[:-1]
+    dlng = np.diff(lng)
+    dlng = (dlng + np.pi) % (2 * np.pi) - np.pi  # shortest way across the antimeridian
+    terms = np.where(same_ring, dlng * (2 + sin_beta[:-1] + sin_beta[1:]), 0.0)
+    ring_area = np.abs(np.bincount(vertex_ring[:-1], weights=terms, minlength=len(rings)))
+    ring_area *= AUTHALIC_RADIUS_M ** 2 / 2
+
+    # get_rings lists each polygon's exterior first, then its holes
+    exterior = np.ones(len(rings), dtype=bool)
+    exterior[1:] = ring_part[1:] != ring_part[:-1]
+    part_area = np.bincount(ring_part, weights=np.where(exterior, ring_area, -ring_area), minlength=len(parts))
+
+    return areas + np.bincount(part_owner, weights=part_area, minlength=len(geometries))
+
+
+def geodesic_area_m2(geometry) -> float:
+    """geodesic_areas_m2() for a single geometry."""
+    return float(geodesic_areas_m2([geometry])[0])
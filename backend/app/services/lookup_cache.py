@@ -0,0 +1,338 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import List, Dict, Optional, Tuple
+from bisect import bisect_left
+import math
+import threading
+
+import numpy as np
+
+from app.models.lookup import LookupTable
+from app.db.session import run_in_db_pool
+
+# (input_values, output_values), both sorted by input_value
+Series = Tuple[List[float], List[float]]
+
+# Input resolution of the dense stage x input grids (percent points)
+GRID_STEP = 0.1
+
+
+def _stage_positions() -> Dict[str, float]:
+    # Ordinal position of each growth stage, used to interpolate between chart columns
+    positions = {"emergence": 0.0, "1stleaf": 1.0, "2ndleaf": 2.0, "3rdleaf": 3.0}
+    positions.update({f"{n}thleaf": float(n) for n in range(4, 19)})
+    for offset, stage in enumerate(["tasseled", "silked", "blister", "milk", "dough", "dent", "mature"]):
+        positions[stage] = 19.0 + offset
+    return positions
+
+
+STAGE_POSITIONS = _stage_positions()
+
+
+class StageGrid:
+    """
+    A 2-D exhibit (input % x growth-stage column) compiled to a dense grid.
+    Rows are chart stages, columns are inputs every GRID_STEP from the lowest
+    charted input; cells outside a stage's charted range are NaN.
+    """
+
+    def __init__(self, table: Dict[Optional[str], Series], step: float = GRID_STEP):
+        columns = {stage: series for stage, series in table.items() if stage is not None and series[0]}
+        self.stages = list(columns)
+        self.rows = {stage.lower(): i for i, stage in enumerate(self.stages)}
+        self.step = step
+
+        lo = min(xs[0] for xs, _ in columns.values())
+        hi = max(xs[-1] for xs, _ in columns.values())
+        self.x0 = math.floor(lo / step + 1e-9) * step
+        size = max(int(round((hi - self.x0) / step)) + 1, 2)
+        # Rounded so on-grid inputs (e.g. 95.5) equal their cell's x exactly
+        axis = np.round(self.x0 + np.arange(size) * step, 9)
+        self.x_max = float(axis[-1])
+
+        self.values = np.full((len(self.stages), size), np.nan)
+        # Cells that sit exactly on a chart point (returned unrounded)
+        self.knots = np.zeros((len(self.stages), size), dtype=bool)
+        for row, stage in enumerate(self.stages):
+            xp = np.asarray(columns[stage][0], dtype=float)
+            fp = np.asarray(columns[stage][1], dtype=float)
+            inside = (axis >= xp[0] - 1e-9) & (axis <= xp[-1] + 1e-9)
+            self.values[row, inside] = self._segment_values(axis[inside], xp, fp)
+            cells = np.round((xp - self.x0) / step).astype(int)
+            self.values[row, cells] = fp
+            self.knots[row, cells] = True
+        # Cell values rounded like LookupTableCache.interpolate() (Python round)
+        self.rounded = np.vectorize(lambda v: v if math.isnan(v) else round(float(v), 2), otypes=[float])(self.values)
+
+    @staticmethod
+    def _segment_values(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+        # Same arithmetic as LookupTableCache.interpolate(), so grid cells match it bit for bit
+        i = np.clip(np.searchsorted(xp, x, side="left"), 1, len(xp) - 1)
+        x1, x2, y1, y2 = xp[i - 1], xp[i], fp[i - 1], fp[i]
+        y = y1 + (x - x1) * (y2 - y1) / (x2 - x1)
+        return np.where(x == xp[i], y2, y) if len(xp) > 1 else np.full(x.shape, fp[0])
+
+    def stage_weights(self, stage: str, interpolate_stages: bool = False) -> List[Tuple[int, float]]:
+        """
+        (row, weight) pairs for a stage: its own column, or, with interpolate_stages,
+        the two charted columns either side of it. Empty when it can't be resolved.
+        """
+        key = stage.lower()
+        if key in self.rows:
+            return [(self.rows[key], 1.0)]
+        position = STAGE_POSITIONS.get(key)
+        if not interpolate_stages or position is None:
+            return []
+
+        charted = sorted(
+            (STAGE_POSITIONS[name], row) for name, row in self.rows.items() if name in STAGE_POSITIONS
+        )
+        below = [c for c in charted if c[0] < position]
+        above = [c for c in charted if c[0] > position]
+        if not below or not above:
+            return []
+        (p1, r1), (p2, r2) = below[-1], above[0]
+        weight = (position - p1) / (p2 - p1)
+        return [(r1, 1.0 - weight), (r2, weight)]
+
+    def lookup(self, input_values: np.ndarray, weights: List[Tuple[int, float]]) -> np.ndarray:
+        """
+        O(1) per input: index the two neighbouring grid cells and blend them.
+        Interpolated values are rounded to 2 dp, exact chart points are not.
+        Returns NaN for inputs off the chart.
+        """
+        x = np.asarray(input_values, dtype=float)
+        if not weights:
+            return np.full(x.shape, np.nan)
+
+        pos = (x - self.x0) / self.step
+        i = np.clip(np.floor(pos + 1e-9).astype(int), 0, self.values.shape[1] - 2)
+        frac = pos - i
+
+        # On a cell boundary take that cell alone: the neighbour may be past
+        # this stage's chart (NaN) while another stage extends the grid
+        at_left = frac < 1e-9
+        at_right = frac > 1 - 1e-9
+        y = np.zeros(x.shape)
+        for row, weight in weights:
+            v = self.values[row]
+            blend = v[i] + frac * (v[i + 1] - v[i])
+            y = y + weight * np.where(at_left, v[i], np.where(at_right, v[i + 1], blend))
+
+        on_cell = np.abs(pos - np.round(pos)) < 1e-6
+        nearest = np.clip(np.round(pos).astype(int), 0, self.values.shape[1] - 1)
+        single = len(weights) == 1
+        exact = on_cell & single & self.knots[weights[0][0], nearest]
+        rounded = np.round(y, 2)
+        if single:
+            # On-grid inputs of one stage: the pre-rounded cell, as interpolate() would round it
+            rounded = np.where(on_cell, self.rounded[weights[0][0], nearest], rounded)
+        y = np.where(exact, y, rounded)
+
+        outside = (x < self.x0 - 1e-9) | (x > self.x_max + 1e-9)
+        return np.where(outside, np.nan, y)
+
+
+class LookupTableCache:
+    """
+    Process-wide compiled cache of USDA lookup tables.
+    Each table is loaded once (single SELECT) and split into sorted
+    (table_name, stage_or_condition) series so interpolation needs no DB access.
+    """
+
+    _tables: Dict[str, Dict[Optional[str], Series]] = {}
+    _grids: Dict[str, Optional[StageGrid]] = {}
+    _load_locks: Dict[str, threading.Lock] = {}
+    _lock = threading.Lock()
+
+    # Bumped on every invalidation; derived caches key on it
+    version = 0
+
+    @classmethod
+    def get_series(
+        cls,
+        db: Session,
+        table_name: str,
+        stage_column: Optional[str] = None
+    ) -> Series:
+        """
+        Returns the sorted series for a table/stage, loading the table on first use.
+        stage_column=None returns the whole table regardless of stage.
+        """
+        table = cls._tables.get(table_name)
+        if table is None:
+            table = cls._load_table(db, table_name)
+        return table.get(stage_column, ([], []))
+
+    @classmethod
+    async def load(cls, db: Session, table_name: str) -> Dict[Optional[str], Series]:
+        """
+        Async get-or-load of a compiled table (stage -> series).
+        The first load runs on the DB thread pool instead of the event loop.
+        """
+        table = cls._tables.get(table_name)
+        if table is None:
+            table = await run_in_db_pool(cls._load_table, db, table_name)
+        return table
+
+    @classmethod
+    def get_grid(cls, table_name: str, table: Dict[Optional[str], Series]) -> Optional[StageGrid]:
+        """
+        Dense grid for a 2-D exhibit (more than one stage column), compiled on
+        first use from the table returned by load(). Returns None for 1-D tables.
+        """
+        if table_name in cls._grids:
+            return cls._grids[table_name]
+
+        columns = [stage for stage, series in table.items() if stage is not None and series[0]]
+        grid = StageGrid(table) if len(columns) > 1 else None
+
+        with cls._lock:
+            # Only pin grids built from the currently pinned table
+            if cls._tables.get(table_name) is table:
+                cls._grids[table_name] = grid
+        return grid
+
+    @classmethod
+    def _load_table(cls, db: Session, table_name: str) -> Dict[Optional[str], Series]:
+        # Per-table lock: concurrent loads of different tables don't wait on each other
+        with cls._lock:
+            load_lock = cls._load_locks.setdefault(table_name, threading.Lock())
+
+        with load_lock:
+            # Another request may have compiled it while we waited
+            if table_name in cls._tables:
+                return cls._tables[table_name]
+
+            rows = db.execute(
+                select(
+                    LookupTable.stage_or_condition,
+                    LookupTable.input_value,
+                    LookupTable.output_value
+                ).where(LookupTable.table_name == table_name)
+            ).all()
+
+            compiled = cls._compile(rows)
+            # Empty (unseeded) tables are pinned too, so misses stay off the DB;
+            # seeding and admin edits invalidate() the entry
+            with cls._lock:
+                cls._tables[table_name] = compiled
+            return compiled
+
+    @staticmethod
+    def _compile(rows) -> Dict[Optional[str], Series]:
+        grouped: Dict[Optional[str], Dict[float, float]] = {None: {}}
+        for stage, x, y in rows:
+            grouped.setdefault(stage, {})[x] = y
+            # Unfiltered series: first row per input wins
+            grouped[None].setdefault(x, y)
+
+        compiled = {}
+        for stage, points in grouped.items():
+            xs = sorted(points)
+            compiled[stage] = (xs, [points[x] for x in xs])
+        return compiled
+
+    @classmethod
+    def preload(cls, table_name: str, rows: List[Tuple[Optional[str], float, float]]):
+        """
+        Installs a table from (stage_or_condition, input_value, output_value) rows
+        without a database, e.g. for benchmarks or offline tooling.
+        """
+        with cls._lock:
+            cls._tables[table_name] = cls._compile(rows)
+            cls._grids.pop(table_name, None)
+            cls.version += 1
+
+    @staticmethod
+    def interpolate(series: Series, input_value: float, table_name: str = "") -> float:
+        """
+        Linear interpolation over a compiled series.
+        Formula: y = y1 + (x - x1) * (y2 - y1) / (x2 - x1)
+        Raises ValueError when input_value lies outside the charted range.
+        """
+        xs, ys = series
+        i = bisect_left(xs, input_value)
+
+        # Exact match
+        if i < len(xs) and xs[i] == input_value:
+            return ys[i]
+
+        if i == 0 or i == len(xs):
+            raise ValueError(f"Value {input_value} out of range for table {table_name}")
+
+        x1, x2 = xs[i - 1], xs[i]
+        y1, y2 = ys[i - 1], ys[i]
+
+        y = y1 + (input_value - x1) * (y2 - y1) / (x2 - x1)
+        return round(y, 2)
+
+    @staticmethod
+    def interpolate_many(
+        series: Series,
+        input_values: np.ndarray,
+        table_name: str = "",
+        fallback: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Vectorized interpolate() for a whole sample set (np.interp over the series).
+        Exact chart hits are returned unrounded, interpolated values rounded to 2 dp.
+        Inputs outside the charted range take the matching `fallback` element;
+        without a fallback they raise ValueError like interpolate().
+        """
+        xs, ys = series
+        x = np.asarray(input_values, dtype=float)
+
+        if xs:
+            xp = np.asarray(xs, dtype=float)
+            fp = np.asarray(ys, dtype=float)
+            y = np.interp(x, xp, fp)
+            nearest = xp[np.minimum(np.searchsorted(xp, x), len(xp) - 1)]
+            y = np.where(nearest == x, y, np.round(y, 2))
+            in_range = (x >= xp[0]) & (x <= xp[-1])
+        else:
+            y = np.zeros_like(x)
+            in_range = np.zeros(x.shape, dtype=bool)
+
+        if in_range.all():
+            return y
+        if fallback is None:
+            raise ValueError(f"Value {x[~in_range][0]} out of range for table {table_name}")
+        return np.where(in_range, y, np.asarray(fallback, dtype=float))
+
+    @staticmethod
+    def interpolate_grid(
+        grid: StageGrid,
+        input_values: np.ndarray,
+        stage: str,
+        table_name: str = "",
+        fallback: Optional[np.ndarray] = None,
+        interpolate_stages: bool = False
+    ) -> np.ndarray:
+        """
+        interpolate_many() for a 2-D exhibit served from its dense grid.
+        Same fallback / ValueError handling for inputs (or stages) off the chart.
+        """
+        x = np.asarray(input_values, dtype=float)
+        y = grid.lookup(x, grid.stage_weights(stage, interpolate_stages))
+        missing = np.isnan(y)
+        if not missing.any():
+            return y
+        if fallback is None:
+            raise ValueError(f"Value {x[missing][0]} out of range for table {table_name} (stage {stage})")
+        return np.where(missing, np.asarray(fallback, dtype=float), y)
+
+    @classmethod
+    def invalidate(cls, table_name: Optional[str] = None):
+        """
+        Drops compiled series so the next lookup reloads from the database.
+        Call after any write to lookup_tables (admin edits, seeding).
+        """
+        with cls._lock:
+            if table_name is None:
+                cls._tables.clear()
+                cls._grids.clear()
+            else:
+                cls._tables.pop(table_name, None)
+                cls._grids.pop(table_name, None)
+            cls.version += 1
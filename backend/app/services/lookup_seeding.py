@@ -0,0 +1,189 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Dict, Any, Callable
+
+from app.models.lookup import LookupTable, LookupSeedVersion
+from app.services.lookup_cache import LookupTableCache
+from app.services.lookup_versions import LookupVersionService
+
+# Bump when the bundled chart data below changes so existing
+# databases pick up the new rows on next startup.
+SEED_VERSION = 1
+
+SeedRows = List[Dict[str, Any]]
+
+
+class LookupSeeder:
+    """
+    Startup-time seeding registry for the USDA lookup tables.
+    Each exhibit registers a builder returning its rows; seed_all() inserts
+    every table that is behind SEED_VERSION with one bulk INSERT per table.
+    """
+
+    _registry: Dict[str, Callable[[], SeedRows]] = {}
+
+    @classmethod
+    def register(cls, table_name: str):
+        def decorator(builder: Callable[[], SeedRows]) -> Callable[[], SeedRows]:
+            cls._registry[table_name] = builder
+            return builder
+        return decorator
+
+    @classmethod
+    def seed_all(cls, db: Session) -> List[str]:
+        """
+        Seeds all registered tables that are missing or on an older seed version.
+        Existing cells are left untouched so admin edits survive re-seeding.
+        Returns the table names that were seeded.
+        """
+        seeded = {
+            marker.table_name: marker.seed_version
+            for marker in db.execute(select(LookupSeedVersion)).scalars()
+        }
+
+        updated = []
+        for table_name, builder in cls._registry.items():
+            if seeded.get(table_name, 0) >= SEED_VERSION:
+                continue
+
+            version = LookupVersionService.next_version(db)
+            rows = [{"table_name": table_name, "row_version": version, **row} for row in builder()]
+            db.execute(
+                insert(LookupTable)
+                .values(rows)
+                .on_conflict_do_nothing(constraint="unique_lookup_cell")
+            )
+            LookupVersionService.record_change(db, table_name, version, f"Seed data v{SEED_VERSION}")
+            db.merge(LookupSeedVersion(table_name=table_name, seed_version=SEED_VERSION))
+            updated.append(table_name)
+
+        db.commit()
+
+        for table_name in updated:
+            LookupTableCache.invalidate(table_name)
+        return updated
+
+
+def _cells(data) -> SeedRows:
+    """(input_value, stage_or_condition, output_value) tuples -> row dicts."""
+    return [
+        {"input_value": float(inp), "stage_or_condition": stage, "output_value": float(out)}
+        for inp, stage, out in data
+    ]
+
+
+def _chart(chart_data: Dict[float, Dict[str, float]]) -> SeedRows:
+    """{input: {stage: output}} chart -> row dicts."""
+    return _cells(
+        (inp, stage, out)
+        for inp, stage_values in chart_data.items()
+        for stage, out in stage_values.items()
+    )
+
+
+@LookupSeeder.register("exhibit11_standReduction")
+def exhibit_11() -> SeedRows:
+    # Exhibit 11 Sample Data (Simplified for MVP)
+    # Columns: Emergence, ..., 10thLeaf
+    # Rows: Percent Stand 50, 55, ... 100
+    stages = ["emergence", "2ndLeaf", "4thLeaf", "6thLeaf", "8thLeaf", "10thLeaf"]
+
+    # Percent Stand -> {Stage: Potential Yield}
+    return _chart({
+        100: {s: 100 for s in stages},
+        90:  {"emergence": 90, "2ndLeaf": 92, "4thLeaf": 94, "6thLeaf": 96, "8thLeaf": 97, "10thLeaf": 98},
+        80:  {"emergence": 80, "2ndLeaf": 84, "4thLeaf": 88, "6thLeaf": 92, "8thLeaf": 94, "10thLeaf": 96},
+        70:  {"emergence": 70, "2ndLeaf": 76, "4thLeaf": 82, "6thLeaf": 88, "8thLeaf": 91, "10thLeaf": 94},
+        60:  {"emergence": 60, "2ndLeaf": 68, "4thLeaf": 76, "6thLeaf": 84, "8thLeaf": 88, "10thLeaf": 92},
+        50:  {"emergence": 50, "2ndLeaf": 60, "4thLeaf": 70, "6thLeaf": 80, "8thLeaf": 85, "10thLeaf": 90}
+    })
+
+
+@LookupSeeder.register("exhibit13_hailStandReduction")
+def exhibit_13() -> SeedRows:
+    # Simplified Data: 7th to 10th leaf
+    # Input: Percent Stand Reduction -> Output: Percent Damage
+    # Example: 10% reduction -> 3% damage (plants recover)
+    stages = ["7thLeaf", "8thLeaf", "9thLeaf", "10thLeaf"]
+    return _chart({
+        10: {s: 3.0 for s in stages},
+        50: {s: 48.0 for s in stages}, # Almost 1:1 at high loss
+        100: {s: 100.0 for s in stages}
+    })
+
+
+@LookupSeeder.register("exhibit14_hailStandReduction")
+def exhibit_14() -> SeedRows:
+    # 11th Leaf to Tassel: Usually nearly 1-to-1 damage
+    stages = ["11thLeaf", "15thLeaf", "tasseled"]
+    return _chart({
+        10: {s: 9.0 for s in stages},
+        50: {s: 50.0 for s in stages},
+        100: {s: 100.0 for s in stages}
+    })
+
+
+@LookupSeeder.register("exhibit15_leafLoss")
+def exhibit_15() -> SeedRows:
+    # Leaf Loss (Defoliation)
+    # Input: % Defoliation -> Output: % Yield Loss
+    # Varies heavily by stage. Tassel stage is most critical.
+    return _cells([
+        # 7th Leaf: 100% de-foliation = 9% yield loss
+        (100.0, "7thLeaf", 9.0), (50.0, "7thLeaf", 4.0),
+        # 10th Leaf: 100% = 16% loss
+        (100.0, "10thLeaf", 16.0), (50.0, "10thLeaf", 7.0),
+        # Tasseled: 100% = 100% loss (Critical)
+        (100.0, "tasseled", 100.0), (50.0, "tasseled", 32.0),
+    ])
+
+
+@LookupSeeder.register("exhibit17_shellingPercentage")
+def exhibit_17() -> SeedRows:
+    # Exhibit 17: Shelling Percentage based on Moisture
+    # High moisture = lower shelling % (cob is heavier/wetter)
+    # USDA typical range: 80% (0.80) at standard 15.5%. Lower at high moisture.
+    # Moisture % -> Shelling Factor
+    data = [
+        (10.0, 0.82), (15.0, 0.80), (20.0, 0.78),
+        (25.0, 0.76), (30.0, 0.74), (35.0, 0.72), (40.0, 0.70)
+    ]
+    return _cells((m, "factor", f) for m, f in data)
+
+
+@LookupSeeder.register("exhibit21_silageMoisture")
+def exhibit_21() -> SeedRows:
+    # Silage Moisture Factors (Standard 65%)
+    # >65% reduces tonnage (water weight)
+    # <65% increases tonnage (dryer than standard)
+    data = [
+        (50.0, 1.4), (55.0, 1.25), (60.0, 1.15), (65.0, 1.0),
+        (70.0, 0.9), (75.0, 0.8), (80.0, 0.7)
+    ]
+    return _cells((m, "factor", f) for m, f in data)
+
+
+@LookupSeeder.register("exhibit23_moistureAdjustment")
+def exhibit_23() -> SeedRows:
+    # USDA Moisture Adjustment Factor = (100 - Actual) / (100 - Standard)
+    # Standard Corn Basis = 15.0%
+    # Example: 20% moisture -> (100-20)/(100-15) = 80/85 = 0.9412
+    data = [
+        (10.0, 1.0588), (15.0, 1.0000), (20.0, 0.9412),
+        (25.0, 0.8824), (30.0, 0.8235), (35.0, 0.7647)
+    ]
+    return _cells((m, "moisture_factor", f) for m, f in data)
+
+
+@LookupSeeder.register("exhibit24_testWeightPack")
+def exhibit_24() -> SeedRows:
+    # Test Weight Factors (Lbs/Bu)
+    # USDA Standards: 56 lbs = 1.0
+    # Lower weights reduce yield: 54->0.98, 50->0.94, etc.
+    data = [
+        (56.0, 1.0), (55.0, 0.99), (54.0, 0.98), (53.0, 0.97),
+        (52.0, 0.96), (51.0, 0.95), (50.0, 0.94), (49.0, 0.93),
+        (48.0, 0.92), (47.0, 0.91), (46.0, 0.90), (45.0, 0.89)
+    ]
+    return _cells((w, "factor", f) for w, f in data)
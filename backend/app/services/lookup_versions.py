@@ -0,0 +1,92 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func, text
+from typing import List, Dict, Any, Optional
+from datetime import date
+import threading
+
+from app.models.lookup import LookupTable, LookupTableVersion
+
+
+class LookupVersionService:
+    """
+    Monotonic versioning of lookup_tables for offline device sync.
+    Every change (seeding, admin edit) takes the next snapshot version;
+    changed cells are stamped with it so clients can download deltas.
+    """
+
+    # Serialized full snapshot of the latest version seen by this worker
+    _snapshot: Optional[Dict[str, Any]] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def next_version(db: Session) -> int:
+        return db.execute(text("SELECT nextval('lookup_snapshot_version_seq')")).scalar()
+
+    @staticmethod
+    def record_change(db: Session, table_name: str, version: int, description: str):
+        """
+        Records `version` as the current version of `table_name`.
+        Caller stamps the changed rows with row_version=version and commits.
+        """
+        db.execute(
+            update(LookupTableVersion)
+            .where(
+                LookupTableVersion.lookup_table_name == table_name,
+                LookupTableVersion.is_current_version == True
+            )
+            .values(is_current_version=False)
+        )
+        db.add(LookupTableVersion(
+            lookup_table_name=table_name,
+            snapshot_version=version,
+            version_number=str(version),
+            effective_date=date.today(),
+            change_description=description,
+            is_current_version=True
+        ))
+
+    @staticmethod
+    def current_version(db: Session) -> int:
+        return db.execute(select(func.coalesce(func.max(LookupTableVersion.snapshot_version), 0))).scalar()
+
+    @staticmethod
+    def etag(version: int) -> str:
+        return f'"lookup-v{version}"'
+
+    @staticmethod
+    def _serialize(rows) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": str(t.id),
+                "table_name": t.table_name,
+                "input_value": t.input_value,
+                "stage_or_condition": t.stage_or_condition,
+                "output_value": t.output_value,
+                "updated_at": t.updated_at,
+                "row_version": t.row_version
+            }
+            for t in rows
+        ]
+
+    @classmethod
+    def get_rows(cls, db: Session, version: int, since_version: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rows changed after since_version, or the full table when it is None.
+        The full snapshot is serialized once per version and reused.
+        """
+        if since_version is not None:
+            rows = db.execute(
+                select(LookupTable)
+                .where(LookupTable.row_version > since_version)
+                .order_by(LookupTable.row_version)
+            ).scalars().all()
+            return cls._serialize(rows)
+
+        snapshot = cls._snapshot
+        if snapshot is not None and snapshot["version"] == version:
+            return snapshot["rows"]
+
+        rows = cls._serialize(db.execute(select(LookupTable)).scalars().all())
+        with cls._lock:
+            cls._snapshot = {"version": version, "rows": rows}
+        return rows
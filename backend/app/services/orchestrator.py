@@ -91,7 +91,7 @@ class AssessmentOrchestrator:
             
         # Sufficiency Check (Step 7: Minimum points logic)
         # Using default field size 10ha if not mapped for MVP
-        field_size = request.field_area_ha or 10.0
+        field_size = request.field_context.field_size_ha or 10.0
         suff_flags = ValidationEngine.validate_sample_sufficiency(field_size, len(request.samples))
         flags.extend(suff_flags)
             
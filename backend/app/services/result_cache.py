@@ -0,0 +1,106 @@
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from pydantic import BaseModel
+import hashlib
+import json
+import threading
+
+from app.core.config import settings
+from app.services.lookup_cache import LookupTableCache
+
+
+class CalculationResultCache:
+    """
+    Content-addressed LRU cache of /calculations results.
+    Keys hash (method, normalized request body, lookup-table version), so an
+    identical re-post is answered without touching the DB or the calculators.
+    Entries are stored as JSON bytes and evicted LRU-first above max_bytes.
+    """
+
+    _entries: "OrderedDict[str, bytes]" = OrderedDict()
+    _size_bytes = 0
+    _lookup_version = LookupTableCache.version
+    _lock = threading.Lock()
+
+    max_bytes = settings.CALCULATION_CACHE_MAX_BYTES
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def make_key(method: str, request: BaseModel) -> str:
+        """
+        Canonical hash of a calculation request.
+        Unset fields are dropped (the calculators treat them differently from
+        explicit nulls) and keys are sorted so field order doesn't matter.
+        """
+        payload = {
+            "method": method,
+            "body": request.model_dump(mode="json", exclude_unset=True),
+            "lookup_version": LookupTableCache.version
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @classmethod
+    def get(cls, key: str) -> Optional[Dict[str, Any]]:
+        with cls._lock:
+            cls._check_lookup_version()
+            blob = cls._entries.get(key)
+            if blob is None:
+                cls.misses += 1
+                return None
+            cls._entries.move_to_end(key)
+            cls.hits += 1
+        # Fresh copy per hit: endpoints may adapt the dict before returning it
+        return json.loads(blob)
+
+    @classmethod
+    def put(cls, key: str, result: Dict[str, Any]):
+        # A bootstrap cut short by its time budget depends on timing, not just
+        # the inputs; cache only reproducible results
+        if (result.get("uncertainty") or {}).get("truncated"):
+            return
+        blob = json.dumps(result, separators=(",", ":")).encode()
+        if len(blob) > cls.max_bytes:
+            return
+
+        with cls._lock:
+            cls._check_lookup_version()
+            previous = cls._entries.pop(key, None)
+            if previous is not None:
+                cls._size_bytes -= len(previous)
+
+            cls._entries[key] = blob
+            cls._size_bytes += len(blob)
+
+            while cls._size_bytes > cls.max_bytes:
+                _, evicted = cls._entries.popitem(last=False)
+                cls._size_bytes -= len(evicted)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._entries.clear()
+            cls._size_bytes = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        total = cls.hits + cls.misses
+        return {
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "hit_rate": round(cls.hits / total, 4) if total else 0.0,
+            "entries": len(cls._entries),
+            "size_bytes": cls._size_bytes,
+            "max_bytes": cls.max_bytes,
+            "lookup_version": cls._lookup_version
+        }
+
+    @classmethod
+    def _check_lookup_version(cls):
+        # A lookup-table edit makes every stored result stale; drop them all
+        # rather than waiting for LRU to age them out. Caller holds the lock.
+        if cls._lookup_version != LookupTableCache.version:
+            cls._entries.clear()
+            cls._size_bytes = 0
+            cls._lookup_version = LookupTableCache.version
@@ -0,0 +1,78 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from typing import List, Dict, Any, Optional
+from uuid import UUID
+import hashlib
+import json
+
+from app.models.spatial import SamplingPlan
+
+
+class SamplingPlanService:
+    """
+    Persisted, deterministic sampling plans.
+    A plan is addressed by a hash of (field, boundary, method, parameters, seed);
+    the same request is answered from the unique plan_key index instead of
+    regenerating points, and sessions reference the plan they were issued.
+    """
+
+    @staticmethod
+    def _digest(payload: Dict[str, Any]) -> str:
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def default_seed(field_id: UUID, boundary_hash: str, method: str,
+                     parameters: Dict[str, Any]) -> int:
+        """
+        Seed for a request that doesn't send one, derived from the request
+        itself so an unseeded repeat resolves to the same stored plan.
+        """
+        digest = SamplingPlanService._digest({
+            "field_id": str(field_id),
+            "boundary": boundary_hash,
+            "method": method,
+            "parameters": parameters
+        })
+        return int(digest[:8], 16) % 2**31
+
+    @staticmethod
+    def plan_key(field_id: UUID, boundary_hash: str, method: str,
+                 parameters: Dict[str, Any], seed: int) -> str:
+        return SamplingPlanService._digest({
+            "field_id": str(field_id),
+            "boundary": boundary_hash,
+            "method": method,
+            "parameters": parameters,
+            "seed": seed
+        })
+
+    @staticmethod
+    def get(db: Session, plan_key: str) -> Optional[SamplingPlan]:
+        return db.execute(
+            select(SamplingPlan).where(SamplingPlan.plan_key == plan_key)
+        ).scalar_one_or_none()
+
+    @staticmethod
+    def save(db: Session, field_id: UUID, plan_key: str, boundary_hash: str, method: str,
+             parameters: Dict[str, Any], seed: int, sample_points: List[Dict[str, Any]]) -> SamplingPlan:
+        """
+        Stores a generated plan. A concurrent identical request may have stored
+        it first; both then return that row (the points are the same).
+        """
+        db.execute(
+            insert(SamplingPlan)
+            .values(
+                field_id=field_id,
+                plan_key=plan_key,
+                boundary_hash=boundary_hash,
+                sampling_method=method,
+                parameters=parameters,
+                seed=seed,
+                sample_points=sample_points
+            )
+            .on_conflict_do_nothing(index_elements=["plan_key"])
+        )
+        db.commit()
+        return SamplingPlanService.get(db, plan_key)
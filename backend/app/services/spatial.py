@@ -1,262 +1,253 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import text
-import math
-import random
+from sqlalchemy.orm import Session, defer, with_expression
+from sqlalchemy import func
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+import numpy as np
+from shapely import wkt
+from shapely.geometry import Point, Polygon
+from shapely.geometry.polygon import orient
+from shapely.validation import explain_validity, make_valid
+
+from app.models.spatial import Field
+from app.services.field_cache import PreparedField
+from app.services.geodesy import geodesic_area_m2
+from app.services.sampling import SamplingEngine, TO_WEB_MERCATOR, haversine_m
+
+# Stored boundary levels: Douglas-Peucker tolerance in degrees (~5 m / ~50 m)
+BOUNDARY_DETAIL_TOLERANCES = {"medium": 0.00005, "low": 0.0005}
+BOUNDARY_DETAIL_LEVELS = ("full", "medium", "low")
+
+
+def detail_for_zoom(zoom: int) -> str:
+    """Boundary level for a web-map zoom (full from ~field scale, low for province views)."""
+    if zoom >= 15:
+        return "full"
+    return "medium" if zoom >= 12 else "low"
+
 class VerisSpatialError(Exception):
     pass
 
+
 class SpatialService:
     """
-    World-class spatial operations for agricultural field management
+    World-class spatial operations for agricultural field management.
+    Boundary geometry is handled in-process with shapely, so field creation
+    and sampling need no PostGIS round trips.
     """
     
+    @staticmethod
+    def build_field_geometry(boundary_coordinates: List[List[float]]) -> Dict[str, Any]:
+        """
+        Single-pass field boundary pipeline, fully in-process.
+        Closes and range-checks the ring, repairs it (make_valid, as ST_MakeValid)
+        and derives area, centroid, bbox and a simplified boundary from the one
+        parsed polygon. Raises VerisSpatialError if the boundary is unusable.
+        
+        Returns:
+            Dict with area_hectares, center_lat, center_lng, bbox, num_points,
+            repaired, boundary_wkt and boundary_levels (level -> WKT)
+        """
+        if len(boundary_coordinates) < 4:
+            raise VerisSpatialError("Minimum 4 coordinate pairs required")
+        
+        # Ensure closed polygon
+        coords = [tuple(c) for c in boundary_coordinates]
+        if coords[0] != coords[-1]:
+            coords.append(coords[0])
+        
+        for lng, lat in coords:
+            if not (-180 <= lng <= 180):
+                raise VerisSpatialError(f"Invalid longitude: {lng}")
+            if not (-90 <= lat <= 90):
+                raise VerisSpatialError(f"Invalid latitude: {lat}")
+        
+        return SpatialService.measure_field_polygon(Polygon(coords))
+    
+    @staticmethod
+    def measure_field_polygon(polygon: Polygon, area_m2: Optional[float] = None) -> Dict[str, Any]:
+        """
+        The repair and metrics half of build_field_geometry, for callers that
+        already hold a lon/lat shapely Polygon (e.g. bulk import).
+        area_m2 may be precomputed with geodesic_areas_m2(); it is ignored
+        when the polygon needs repair.
+        """
+        min_lng, min_lat, max_lng, max_lat = polygon.bounds
+        if not (-180 <= min_lng and max_lng <= 180 and -90 <= min_lat and max_lat <= 90):
+            raise VerisSpatialError("Coordinates out of range (expected WGS84 longitude/latitude)")
+        
+        repaired = False
+        if not polygon.is_valid:
+            # Keep the repair only if it is still a single polygon (the column type)
+            reason = explain_validity(polygon)
+            fixed = make_valid(polygon)
+            parts = [g for g in getattr(fixed, "geoms", [fixed])
+                     if g.geom_type == "Polygon" and not g.is_empty]
+            if len(parts) != 1:
+                raise VerisSpatialError(f"Invalid polygon geometry: {reason}")
+            polygon = orient(parts[0])
+            repaired = True
+            area_m2 = None
+        
+        # Ellipsoidal area (EPSG:3857 overstated it by ~10% at Zimbabwe's latitude)
+        if area_m2 is None:
+            area_m2 = geodesic_area_m2(polygon)
+        area_hectares = area_m2 / 10000.0
+        if area_hectares < 0.01:  # Minimum 100 square meters
+            raise VerisSpatialError("Field too small (minimum 0.01 hectares)")
+        if area_hectares > 10000:  # Maximum 10,000 hectares
+            raise VerisSpatialError("Field too large (maximum 10,000 hectares)")
+        
+        centroid = polygon.centroid
+        min_lng, min_lat, max_lng, max_lat = polygon.bounds
+        boundary_levels = SpatialService.simplify_levels(polygon)
+        
+        return {
+            "valid": True,
+            "area_hectares": round(float(area_hectares), 4),
+            "center_lat": float(centroid.y),
+            "center_lng": float(centroid.x),
+            "bbox": [min_lng, min_lat, max_lng, max_lat],
+            "num_points": len(polygon.exterior.coords),
+            "repaired": repaired,
+            "boundary_wkt": polygon.wkt,
+            "boundary_levels": boundary_levels
+        }
+    
+    @staticmethod
+    def simplify_levels(polygon: Polygon) -> Dict[str, str]:
+        """
+        Simplified WKT per stored detail level, each from the previous level.
+        A level that collapses the polygon or loses more than 10% of its area
+        (a field small against the tolerance) keeps the finer one.
+        """
+        levels = {}
+        current = polygon
+        for level, tolerance in BOUNDARY_DETAIL_TOLERANCES.items():
+            simplified = current.simplify(tolerance, preserve_topology=True)
+            if (simplified.geom_type == "Polygon" and not simplified.is_empty
+                    and abs(simplified.area - polygon.area) <= 0.1 * polygon.area):
+                current = simplified
+            levels[level] = current.wkt
+        return levels
+    
+    @staticmethod
+    def boundary_detail_options(detail: str = "full") -> tuple:
+        """
+        Query options rendering Field.field_boundary_wkt at a detail level
+        (and skipping the raw full-resolution column),
+        e.g. select(Field).options(*SpatialService.boundary_detail_options("low")).
+        """
+        if detail not in BOUNDARY_DETAIL_TOLERANCES:
+            expression = Field.field_boundary
+        else:
+            # Rows written before the level existed fall back to the full boundary
+            expression = func.coalesce(getattr(Field, f"boundary_{detail}"), Field.field_boundary)
+        return (
+            defer(Field.field_boundary),
+            with_expression(Field.field_boundary_wkt, func.ST_AsText(expression))
+        )
+    
     @staticmethod
     async def calculate_field_metrics(boundary_coordinates: List[List[float]], 
-                                    db: Session) -> Dict[str, Any]:
+                                    db: Session = None) -> Dict[str, Any]:
         """
         Calculate field area and center from GPS boundary coordinates
         
         Args:
             boundary_coordinates: List of [longitude, latitude] pairs
-            db: Database session
+            db: Unused, kept for callers; see build_field_geometry
             
         Returns:
             Dict with area_hectares, center_lat, center_lng, boundary_wkt
         """
         try:
-            # Validate coordinates
-            if len(boundary_coordinates) < 4:
-                raise VerisSpatialError("Field boundary requires minimum 4 coordinate pairs")
-            
-            # Ensure polygon is closed
-            if boundary_coordinates[0] != boundary_coordinates[-1]:
-                boundary_coordinates.append(boundary_coordinates[0])
-            
-            # Create WKT polygon string
-            coords_wkt = ",".join([f"{lng} {lat}" for lng, lat in boundary_coordinates])
-            boundary_wkt = f"POLYGON(({coords_wkt}))"
-            
-            # Calculate area using PostGIS (accurate spherical calculation)
-            # Casting to geometry/geography for area calculation
-            area_query = text("""
-                SELECT ST_Area(ST_Transform(ST_GeomFromText(:wkt, 4326), 3857)) / 10000.0 as area_hectares
-            """)
-            area_result = db.execute(area_query, {"wkt": boundary_wkt})
-            area_hectares = area_result.scalar()
-            
-            # Calculate centroid
-            centroid_query = text("""
-                SELECT ST_Y(ST_Centroid(ST_GeomFromText(:wkt, 4326))) as lat,
-                       ST_X(ST_Centroid(ST_GeomFromText(:wkt, 4326))) as lng
-            """)
-            centroid_result = db.execute(centroid_query, {"wkt": boundary_wkt})
-            centroid_row = centroid_result.fetchone()
-            
-            return {
-                "area_hectares": round(float(area_hectares), 4),
-                "center_lat": float(centroid_row.lat),
-                "center_lng": float(centroid_row.lng),
-                "boundary_wkt": boundary_wkt
-            }
-            
-        except Exception as e:
+            return SpatialService.build_field_geometry(boundary_coordinates)
+        except VerisSpatialError as e:
             raise VerisSpatialError(f"Failed to calculate field metrics: {str(e)}")
     
     @staticmethod
-    async def generate_sampling_points(field_boundary_wkt: str, 
+    async def generate_sampling_points(field_boundary_wkt: Optional[str], 
                                      min_samples: int,
                                      method: str = "random",
                                      edge_buffer_meters: float = 5.0,
                                      min_distance_meters: float = 20.0,
-                                     db: Session = None) -> List[Dict[str, Any]]:
+                                     db: Session = None,
+                                     seed: Optional[int] = None,
+                                     prepared_field: Optional[PreparedField] = None) -> List[Dict[str, Any]]:
         """
         Generate GPS sampling points within field boundary using USDA methodology
         
         This is the core Verisca differentiator - automated, unbiased sampling
+        
+        The boundary is parsed and buffered once into a FieldGeometry and the
+        method is looked up in SamplingEngine (random, systematic, stratified,
+        poisson_disk), with no database round trips (db is unused).
+        The same seed always reproduces the same points.
+        Pass prepared_field (from FieldGeometryCache) to skip parsing and
+        buffering the boundary; field_boundary_wkt is then ignored.
         """
         try:
-            # Get field bounds from database for accurate calculations
-            bounds_query = text("""
-                SELECT ST_XMin(geom) as min_lng, ST_YMin(geom) as min_lat,
-                       ST_XMax(geom) as max_lng, ST_YMax(geom) as max_lat
-                FROM (SELECT ST_GeomFromText(:wkt, 4326) as geom) as subq
-            """)
-            bounds_result = db.execute(bounds_query, {"wkt": field_boundary_wkt})
-            bounds = bounds_result.fetchone()
-            
-            # Convert buffer distances to degree approximations
-            # At equator: 1 degree ≈ 111,000 meters
-            # Adjusted for latitude (approximate for Zimbabwe: -17 to -22 degrees)
-            lat_center = (bounds.min_lat + bounds.max_lat) / 2
-            meters_per_degree = 111000 * abs(math.cos(math.radians(lat_center)))
+            if prepared_field is None:
+                prepared_field = PreparedField(wkt.loads(field_boundary_wkt))
+            geometry = prepared_field.interior(edge_buffer_meters)
+            coordinates = SamplingEngine.sample(
+                method, geometry, min_samples, min_distance_meters, np.random.default_rng(seed)
+            )
+            
+            if len(coordinates) < min_samples:
+                # Fallback or warning if strict constraints prevent finding points
+                # For now we raise validation error
+                raise VerisSpatialError(
+                    f"Could only generate {len(coordinates)} of {min_samples} required points. "
+                    f"Field may be too small or constraints too restrictive."
+                )
             
-            edge_buffer_degrees = edge_buffer_meters / meters_per_degree
+            # Edge distances are measured in EPSG:3857 metres, as PostGIS did
+            field_edge_3857 = prepared_field.edge_3857
+            label = method.replace("_", "-").capitalize()
             
-            # Generate sample points
             points = []
-            max_attempts = min_samples * 100  # Prevent infinite loops
-            attempts = 0
-            
-            while len(points) < min_samples and attempts < max_attempts:
-                # Generate random candidate point
-                candidate_lng = random.uniform(bounds.min_lng, bounds.max_lng)
-                candidate_lat = random.uniform(bounds.min_lat, bounds.max_lat)
-                
-                # Check if point is inside field with buffer
-                # Note: ST_Buffer with negative value shrinks the polygon
-                inside_check = text("""
-                    SELECT ST_Contains(
-                        ST_Buffer(ST_GeomFromText(:wkt, 4326), :buffer),
-                        ST_Point(:lng, :lat)
-                    )
-                """)
-                
-                # buffer is in degrees, so we need to be careful. 
-                # For basic POINT/POLYGON in 4326, ST_Buffer unit is degrees.
-                # -edge_buffer_degrees effectively shrinks the polygon boundary.
-                inside_result = db.execute(inside_check, {
-                    "wkt": field_boundary_wkt,
-                    "buffer": -edge_buffer_degrees, 
-                    "lng": candidate_lng,
-                    "lat": candidate_lat
-                })
-                
-                if not inside_result.scalar():
-                    attempts += 1
-                    continue
-                
-                # Check minimum distance from other points
-                too_close = False
-                for point in points:
-                    dist = SpatialService._calculate_distance(
-                        candidate_lat, candidate_lng,
-                        point['lat'], point['lng']
-                    )
-                    if dist < min_distance_meters:
-                        too_close = True
-                        break
-                
-                if too_close:
-                    attempts += 1
-                    continue
-                
+            for lat, lng in coordinates:
                 # Calculate distance from field edge for quality assessment
-                edge_distance_query = text("""
-                    SELECT ST_Distance(
-                        ST_Transform(ST_GeomFromText('POINT(' || :lng || ' ' || :lat || ')', 4326), 3857),
-                        ST_Transform(ST_Boundary(ST_GeomFromText(:wkt, 4326)), 3857)
-                    ) as distance_meters
-                """)
+                x, y = TO_WEB_MERCATOR.transform(lng, lat)
+                edge_distance = field_edge_3857.distance(Point(x, y))
                 
-                edge_result = db.execute(edge_distance_query, {
-                    "lng": candidate_lng,
-                    "lat": candidate_lat,
-                    "wkt": field_boundary_wkt
-                })
-                
-                edge_distance = edge_result.scalar()
-                
-                # Add point to collection
                 points.append({
                     "sample_number": len(points) + 1,
-                    "lat": round(candidate_lat, 7),  # ~1cm precision
-                    "lng": round(candidate_lng, 7),
+                    "lat": lat,
+                    "lng": lng,
                     "distance_from_edge_meters": round(float(edge_distance), 1),
                     "gps_accuracy_required": "sub_meter",  # Mobile app guidance
-                    "sampling_notes": f"Random point {len(points) + 1} of {min_samples}"
+                    "sampling_notes": f"{label} point {len(points) + 1} of {len(coordinates)}"
                 })
-                
-                attempts += 1
-            
-            if len(points) < min_samples:
-                # Fallback or warning if strict constraints prevent finding points
-                # For now we raise validation error
-                raise VerisSpatialError(
-                    f"Could only generate {len(points)} of {min_samples} required points. "
-                    f"Field may be too small or constraints too restrictive."
-                )
             
             return points
             
+        except VerisSpatialError:
+            raise
+        except ValueError as e:
+            # Unknown sampling method
+            raise VerisSpatialError(str(e))
         except Exception as e:
-            if isinstance(e, VerisSpatialError):
-                raise e
             raise VerisSpatialError(f"Sampling point generation failed: {str(e)}")
     
     @staticmethod
     def _calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
         """Calculate distance between two GPS points using Haversine formula"""
-        from math import radians, cos, sin, asin, sqrt
-        
-        # Convert to radians
-        lat1, lng1, lat2, lng2 = map(radians, [lat1, lng1, lat2, lng2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlng = lng2 - lng1
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlng/2)**2
-        c = 2 * asin(sqrt(a))
-        r = 6371000  # Earth radius in meters
-        
-        return c * r
+        return haversine_m(lat1, lng1, lat2, lng2)
     
     @staticmethod
     async def validate_field_boundary(coordinates: List[List[float]], 
-                                    db: Session) -> Dict[str, Any]:
+                                    db: Session = None) -> Dict[str, Any]:
         """
         Comprehensive field boundary validation
+        Returns {"valid": False, "error": ...} instead of raising; on success the
+        result carries the full build_field_geometry() metrics.
         """
         try:
-            # Basic coordinate validation
-            if len(coordinates) < 4:
-                return {"valid": False, "error": "Minimum 4 coordinate pairs required"}
-            
-            # Ensure closed polygon
-            coords = coordinates.copy()
-            if coords[0] != coords[-1]:
-                coords.append(coords[0])
-            
-            # Check coordinate ranges (rough bounds for Africa/Zimbabwe context)
-            for lng, lat in coords:
-                if not (-180 <= lng <= 180):
-                    return {"valid": False, "error": f"Invalid longitude: {lng}"}
-                if not (-90 <= lat <= 90):
-                    return {"valid": False, "error": f"Invalid latitude: {lat}"}
-            
-            # Create polygon and validate with PostGIS
-            coords_wkt = ",".join([f"{lng} {lat}" for lng, lat in coords])
-            boundary_wkt = f"POLYGON(({coords_wkt}))"
-            
-            # Check self-intersection and other geometry issues
-            validation_query = text("""
-                SELECT 
-                    ST_IsValid(ST_GeomFromText(:wkt, 4326)) as is_valid,
-                    ST_IsValidReason(ST_GeomFromText(:wkt, 4326)) as reason,
-                    ST_Area(ST_Transform(ST_GeomFromText(:wkt, 4326), 3857)) / 10000.0 as area_hectares,
-                    ST_NumPoints(ST_GeomFromText(:wkt, 4326)) as num_points
-            """)
-            
-            result = db.execute(validation_query, {"wkt": boundary_wkt})
-            row = result.fetchone()
-            
-            if not row.is_valid:
-                return {"valid": False, "error": f"Invalid polygon geometry: {row.reason}"}
-            
-            if row.area_hectares < 0.01:  # Minimum 100 square meters
-                return {"valid": False, "error": "Field too small (minimum 0.01 hectares)"}
-                
-            if row.area_hectares > 10000:  # Maximum 10,000 hectares
-                return {"valid": False, "error": "Field too large (maximum 10,000 hectares)"}
-            
-            return {
-                "valid": True,
-                "area_hectares": round(float(row.area_hectares), 4),
-                "num_points": int(row.num_points),
-                "boundary_wkt": boundary_wkt
-            }
-            
+            return SpatialService.build_field_geometry(coordinates)
+        except VerisSpatialError as e:
+            return {"valid": False, "error": str(e)}
         except Exception as e:
             return {"valid": False, "error": f"Validation failed: {str(e)}"}
@@ -0,0 +1,150 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, text
+from typing import Optional
+from pathlib import Path
+import os
+import shutil
+import uuid
+
+from app.core.config import settings
+from app.models.spatial import MapDataVersion
+from app.services.spatial import detail_for_zoom
+
+MAX_TILE_ZOOM = 22
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+# Below this zoom fields are drawn as centre points rather than polygons
+FIELD_POLYGON_MIN_ZOOM = 10
+
+_FIELD_GEOMETRY = {
+    "full": "f.field_boundary",
+    "medium": "coalesce(f.boundary_medium, f.field_boundary)",
+    "low": "coalesce(f.boundary_low, f.field_boundary)"
+}
+
+# One "fields" layer: tenant fields in the tile (GiST on the lon/lat column),
+# each with its latest claim. {geometry} / {filter_column} come from the
+# fixed _FIELD_GEOMETRY choices above, never from the request.
+_FIELDS_TILE_SQL = """
+WITH bounds AS (
+    SELECT ST_TileEnvelope(:z, :x, :y) AS tile,
+           ST_Transform(ST_TileEnvelope(:z, :x, :y, margin => :margin), 4326) AS area
+),
+features AS (
+    SELECT ST_AsMVTGeom(ST_Transform({geometry}, 3857), bounds.tile, :extent, :buffer, true) AS geom,
+           f.id::text AS field_id,
+           f.field_code,
+           f.field_name,
+           f.field_area::float8 AS area_hectares,
+           c.id::text AS claim_id,
+           c.claim_number,
+           c.status AS claim_status
+    FROM bounds
+    JOIN fields f ON {filter_column} && bounds.area
+    JOIN farms ON farms.id = f.farm_id
+    LEFT JOIN LATERAL (
+        SELECT claims.id, claims.claim_number, claims.status
+        FROM claims
+        WHERE claims.field_id = f.id AND claims.tenant_id = :tenant_id
+        ORDER BY claims.created_at DESC
+        LIMIT 1
+    ) c ON true
+    WHERE farms.tenant_id = :tenant_id
+)
+SELECT ST_AsMVT(features, 'fields', :extent, 'geom') FROM features WHERE geom IS NOT NULL
+"""
+
+
+class VectorTileService:
+    """
+    Mapbox Vector Tiles of a tenant's fields and claim status, rendered by
+    PostGIS (ST_AsMVT) and cached on disk under TILE_CACHE_DIR as
+    <tenant>/v<version>/<z>/<x>/<y>.mvt. The version is the tenant's
+    map_data_versions row, bumped by triggers on fields and claims, so any
+    write moves readers to fresh keys; older version directories are pruned.
+    """
+
+    root = Path(settings.TILE_CACHE_DIR)
+
+    @staticmethod
+    def valid_tile(z: int, x: int, y: int) -> bool:
+        return 0 <= z <= MAX_TILE_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+    @staticmethod
+    def data_version(db: Session, tenant_id) -> int:
+        version = db.execute(
+            select(MapDataVersion.version).where(MapDataVersion.tenant_id == tenant_id)
+        ).scalar()
+        return version or 0
+
+    @staticmethod
+    def etag(tenant_id, version: int) -> str:
+        return f'"tiles-{tenant_id}-v{version}"'
+
+    @staticmethod
+    def render(db: Session, tenant_id, z: int, x: int, y: int) -> bytes:
+        if z < FIELD_POLYGON_MIN_ZOOM:
+            geometry = filter_column = "f.field_center"
+        else:
+            geometry = _FIELD_GEOMETRY[detail_for_zoom(z)]
+            filter_column = "f.field_boundary"
+
+        tile = db.execute(
+            text(_FIELDS_TILE_SQL.format(geometry=geometry, filter_column=filter_column)),
+            {
+                "z": z, "x": x, "y": y,
+                "margin": TILE_BUFFER / TILE_EXTENT,
+                "extent": TILE_EXTENT,
+                "buffer": TILE_BUFFER,
+                "tenant_id": tenant_id
+            }
+        ).scalar()
+        return bytes(tile) if tile else b""
+
+    @classmethod
+    def _path(cls, tenant_id, version: int, z: int, x: int, y: int) -> Path:
+        return cls.root / str(tenant_id) / f"v{version}" / str(z) / str(x) / f"{y}.mvt"
+
+    @classmethod
+    def get_tile(cls, db: Session, tenant_id, version: int, z: int, x: int, y: int) -> bytes:
+        """
+        Tile bytes for a data version (read by the caller before rendering,
+        so a cached tile is never older than its key). Empty tiles are cached too.
+        """
+        path = cls._path(tenant_id, version, z, x, y)
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            pass
+
+        tile = cls.render(db, tenant_id, z, x, y)
+
+        version_dir = cls.root / str(tenant_id) / f"v{version}"
+        if not version_dir.exists():
+            cls._prune(tenant_id, keep=version)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial tile
+            tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp.write_bytes(tile)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Warning: Could not cache tile {z}/{x}/{y}: {e}")
+        return tile
+
+    @classmethod
+    def _prune(cls, tenant_id, keep: int):
+        """Removes a tenant's cached tiles for versions older than `keep`."""
+        tenant_dir = cls.root / str(tenant_id)
+        if not tenant_dir.is_dir():
+            return
+        for version_dir in tenant_dir.iterdir():
+            name = version_dir.name
+            if name.startswith("v") and name[1:].isdigit() and int(name[1:]) < keep:
+                shutil.rmtree(version_dir, ignore_errors=True)
+
+    @classmethod
+    def invalidate(cls, tenant_id: Optional[object] = None):
+        """Drops cached tiles for one tenant, or all of them."""
+        target = cls.root / str(tenant_id) if tenant_id is not None else cls.root
+        shutil.rmtree(target, ignore_errors=True)
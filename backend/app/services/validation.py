@@ -1,7 +1,9 @@
 
 from typing import List, Dict, Any, Optional
 import math
+from shapely import wkt
 from app.schemas.intelligence import ValidationFlag
+from app.services.field_cache import PreparedField
 
 class ValidationEngine:
     """
@@ -146,15 +148,50 @@ class ValidationEngine:
     @staticmethod
     def validate_gps_consistency(
         samples: List[Any], # List of AssessmentSampleInput
-        field_boundary_wkt: Optional[str] = None
+        field_boundary_wkt: Optional[str] = None,
+        prepared_field: Optional[PreparedField] = None
     ) -> List[ValidationFlag]:
         """
         Checks if points are distinct and within field (if boundary provided).
+        Samples need lat/lng (dicts or objects); pass prepared_field from
+        FieldGeometryCache to avoid re-parsing the boundary.
         """
         flags = []
         # Need logic here to check distances between points (Cluster detection)
         # For now, simple duplicate check
         
-        # TODO: Implement point-in-polygon if WKT provided
+        located = []
+        for s in samples:
+            get = s.get if isinstance(s, dict) else lambda k: getattr(s, k, None)
+            if get("lat") is not None and get("lng") is not None:
+                located.append((get("sample_number"), float(get("lat")), float(get("lng"))))
+        if not located:
+            return flags
+        
+        seen = {}
+        for number, lat, lng in located:
+            key = (round(lat, 6), round(lng, 6))
+            if key in seen:
+                flags.append(ValidationFlag(
+                    check_type="consistency",
+                    status="WARNING",
+                    message=f"Samples {seen[key]} and {number} share the same GPS position.",
+                    confidence_score=0.90
+                ))
+            else:
+                seen[key] = number
+        
+        if prepared_field is None and field_boundary_wkt:
+            prepared_field = PreparedField(wkt.loads(field_boundary_wkt))
+        if prepared_field is not None:
+            inside = prepared_field.contains_many([p[1] for p in located], [p[2] for p in located])
+            outside = [number for (number, _, _), ok in zip(located, inside) if not ok]
+            if outside:
+                flags.append(ValidationFlag(
+                    check_type="consistency",
+                    status="FAIL",
+                    message=f"Samples outside field boundary: {outside}",
+                    confidence_score=0.95
+                ))
         
         return flags
@@ -0,0 +1,239 @@
+"""
+Reproducible benchmarks for CalculationService and AssessmentOrchestrator.
+
+Runs every calculation method at several sample counts against the bundled
+USDA seed data preloaded into LookupTableCache (no database or server), and
+reports per-call latency and allocations (tracemalloc).
+
+    cd backend
+    python -m benchmarks.calculations                      # print results
+    python -m benchmarks.calculations --write benchmarks/baseline.json
+    python -m benchmarks.calculations --compare benchmarks/baseline.json
+
+Commit the baseline so regressions show up as a diff; --compare also exits
+non-zero when a case is slower / allocates more than --threshold.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date
+from typing import List, Dict, Any, Callable, Awaitable, Optional
+
+# Settings need these; nothing here touches a database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import numpy as np
+
+from app.services.calculations import CalculationService
+from app.services.orchestrator import AssessmentOrchestrator
+from app.services.lookup_cache import LookupTableCache
+from app.services.lookup_seeding import LookupSeeder
+from app.services.result_cache import CalculationResultCache
+from app.schemas.intelligence import (
+    ComprehensiveAssessmentRequest, AssessmentSampleInput, FieldContext,
+    MarketData, PerilType, GrowthStage
+)
+
+DEFAULT_SIZES = [5, 50, 500, 5000]
+SEED = 42
+
+# Minimum timed iterations / wall time per case
+MIN_ITERATIONS = 5
+MAX_ITERATIONS = 200
+MIN_SECONDS = 0.2
+
+Case = Callable[[], Awaitable[Any]]
+
+
+class _NoDB:
+    """Stand-in session: every lookup is served from the preloaded cache."""
+
+    def execute(self, *args, **kwargs):
+        raise RuntimeError("Benchmark touched the database; preload the table instead")
+
+
+def preload_lookup_tables():
+    """Installs the bundled seed data for every registered exhibit."""
+    for table_name, builder in LookupSeeder._registry.items():
+        rows = [(r["stage_or_condition"], r["input_value"], r["output_value"]) for r in builder()]
+        LookupTableCache.preload(table_name, rows)
+
+
+def build_cases(n: int) -> Dict[str, Case]:
+    rng = np.random.default_rng(SEED)
+    db = _NoDB()
+
+    stand = [
+        {"sample_number": i, "surviving_plants": int(c), "length_measured_m": 10.0, "row_width_m": 0.9}
+        for i, c in enumerate(rng.integers(20, 37, n))
+    ]
+    hail = [
+        {"sample_number": i, "original_stand_count": 40, "destroyed_plants": int(d), "percent_defoliation": float(f)}
+        for i, (d, f) in enumerate(zip(rng.integers(0, 20, n), rng.uniform(50, 100, n)))
+    ]
+    weight = [
+        {"sample_number": i, "fresh_weight_kg": float(w), "sample_area_m2": 10.0, "foreign_material_pct": float(fm)}
+        for i, (w, fm) in enumerate(zip(rng.uniform(3, 8, n), rng.uniform(0, 2, n)))
+    ]
+    maturity = [
+        {"sample_number": i, "weight_lbs": float(w), "sample_area_acres": 0.001, "maturity_line_position": float(m)}
+        for i, (w, m) in enumerate(zip(rng.uniform(0.3, 0.7, n), rng.uniform(0, 100, n)))
+    ]
+    tonnage = [
+        {"sample_number": i, "fresh_weight_kg": float(w), "sample_area_m2": 4.047}
+        for i, w in enumerate(rng.uniform(10, 20, n))
+    ]
+    assessment = ComprehensiveAssessmentRequest(
+        primary_peril=PerilType.DROUGHT,
+        growth_stage=GrowthStage.MATURE,
+        measurement_date=date(2024, 3, 1),
+        field_context=FieldContext(field_size_ha=25.0),
+        market_data=MarketData(grain_price_per_tonne=300.0, silage_price_per_tonne=60.0),
+        samples=[
+            AssessmentSampleInput(sample_number=s["sample_number"], weights={"fresh_weight": s["fresh_weight_kg"]})
+            for s in weight
+        ],
+        moisture_pct=18.0,
+        test_weight_kg_hl=70.0
+    )
+
+    return {
+        "stand_reduction": lambda: CalculationService.calculate_stand_reduction(db, stand, "8thLeaf"),
+        "hail_damage": lambda: CalculationService.calculate_hail_damage(db, hail, "10thLeaf"),
+        "weight_method": lambda: CalculationService.calculate_weight_method(
+            db, weight, moisture_pct=18.0, test_weight_kg_hl=70.0
+        ),
+        "maturity_line_weight": lambda: CalculationService.calculate_maturity_line_weight(db, maturity, "R5"),
+        "tonnage_method": lambda: CalculationService.calculate_tonnage_method(
+            db, tonnage, moisture_pct=70.0, quality_grade="good"
+        ),
+        "comprehensive_assessment": lambda: AssessmentOrchestrator.perform_comprehensive_assessment(db, assessment),
+    }
+
+
+def build_scalar_cases() -> Dict[str, Case]:
+    """Methods that don't take samples; run once, independent of size."""
+    return {
+        "replanting_analysis": lambda: CalculationService.calculate_replanting_analysis(
+            normal_yield_kg_ha=9000.0, price_per_kg=0.3, share=1.0,
+            stand_pct=60.0, replant_cost_per_ha=250.0, replant_factor=0.85
+        ),
+        "stage_modification": lambda: CalculationService.calculate_stage_modification(55, 100),
+    }
+
+
+async def measure(case: Case) -> Dict[str, Any]:
+    for _ in range(3):
+        await case()
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MAX_ITERATIONS and (
+        len(timings) < MIN_ITERATIONS or time.perf_counter() - started < MIN_SECONDS
+    ):
+        t0 = time.perf_counter()
+        await case()
+        timings.append(time.perf_counter() - t0)
+
+    # Allocations from one separately traced call (tracing distorts timings)
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    await case()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "iterations": len(timings),
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "p95_ms": round(timings[int(0.95 * (len(timings) - 1))] * 1000, 4),
+        "peak_alloc_kib": round((peak - baseline) / 1024, 1),
+        "retained_kib": round((current - baseline) / 1024, 1)
+    }
+
+
+async def run(sizes: List[int]) -> Dict[str, Any]:
+    preload_lookup_tables()
+    # Benchmark the calculators, not the endpoint result cache
+    CalculationResultCache.clear()
+
+    results: Dict[str, Any] = {}
+    for n in sizes:
+        for name, case in build_cases(n).items():
+            results[f"{name}[n={n}]"] = await measure(case)
+    for name, case in build_scalar_cases().items():
+        results[name] = await measure(case)
+
+    return {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "sizes": sizes,
+        "results": results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Cases whose median latency or peak allocation grew by more than threshold."""
+    regressions = []
+    for case, now in current["results"].items():
+        before = baseline.get("results", {}).get(case)
+        if before is None:
+            continue
+        for metric in ("median_ms", "peak_alloc_kib"):
+            if before[metric] > 0 and now[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    f"{case}: {metric} {before[metric]} -> {now[metric]} "
+                    f"(+{(now[metric] / before[metric] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_table(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    print(f"{'case':<38} {'median ms':>10} {'p95 ms':>10} {'peak KiB':>10} {'vs base':>8}")
+    for case, r in report["results"].items():
+        delta = ""
+        before = (baseline or {}).get("results", {}).get(case)
+        if before and before["median_ms"] > 0:
+            delta = f"{(r['median_ms'] / before['median_ms'] - 1) * 100:+.0f}%"
+        print(f"{case:<38} {r['median_ms']:>10.3f} {r['p95_ms']:>10.3f} {r['peak_alloc_kib']:>10.1f} {delta:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CalculationService methods")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--write", metavar="PATH", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed regression (0.25 = +25%%)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.sizes))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_table(report, baseline)
+
+    if args.write:
+        with open(args.write, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.write}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Load test: concurrent /calculations/* requests against a slow database.
+
+Runs the FastAPI app in-process (httpx ASGITransport) with get_db replaced
+by a stand-in Session whose every query blocks for --db-latency-ms, like a
+real psycopg2 round-trip. Each round starts with cold lookup and result
+caches, fires the calculation endpoints concurrently and records how long
+the event loop was stalled (any other request on the worker waits that long).
+
+    cd backend
+    python -m benchmarks.load_calculations
+    python -m benchmarks.load_calculations --blocking   # old behaviour: DB work on the event loop
+
+With DB work on the thread pool the concurrent wall time approaches the
+slowest chain of queries and the loop stays responsive; with --blocking
+every query stalls the loop, so the requests serialize.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import List, Dict, Any
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx
+
+from app.main import app
+from app.db.session import get_db
+from app.services import lookup_cache
+from app.services.lookup_cache import LookupTableCache
+from app.services.lookup_seeding import LookupSeeder
+from app.services.result_cache import CalculationResultCache
+
+PREFIX = "/api/v1/calculations"
+
+SEED_ROWS = {
+    table_name: [(r["stage_or_condition"], r["input_value"], r["output_value"]) for r in builder()]
+    for table_name, builder in LookupSeeder._registry.items()
+}
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class SlowSession:
+    """Answers LookupTableCache loads from the seed data after a blocking delay."""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def execute(self, statement, *args, **kwargs):
+        time.sleep(self.latency_s)
+        params = statement.compile().params.values()
+        table_name = next((v for v in params if v in SEED_ROWS), None)
+        return _Rows(SEED_ROWS.get(table_name, []))
+
+    def close(self):
+        pass
+
+
+def _samples(n: int, **fields) -> List[Dict[str, Any]]:
+    return [{"sample_number": i + 1, **fields} for i in range(n)]
+
+
+def calculation_requests(samples: int) -> List[tuple]:
+    return [
+        ("stand-reduction", {
+            "growth_stage": "8thLeaf",
+            "samples": _samples(samples, surviving_plants=28)
+        }),
+        ("hail-damage", {
+            "growth_stage": "10thLeaf",
+            "samples": _samples(samples, original_stand_count=40, destroyed_plants=6, percent_defoliation=60.0)
+        }),
+        ("maturity-line-weight", {
+            "growth_stage": "R5",
+            "samples": _samples(samples, weight_lbs=0.5, sample_area_acres=0.001, maturity_line_position=50.0)
+        }),
+        ("tonnage-method", {
+            "growth_stage": "R5",
+            "moisture_pct": 70.0,
+            "samples": _samples(samples, fresh_weight_lbs=20.0, quality_grade="good")
+        }),
+    ]
+
+
+async def _timed_post(client: httpx.AsyncClient, path: str, body: Dict[str, Any]) -> float:
+    t0 = time.perf_counter()
+    response = await client.post(f"{PREFIX}/{path}", json=body)
+    response.raise_for_status()
+    return time.perf_counter() - t0
+
+
+async def _monitor_loop(stop: asyncio.Event, lags: List[float], interval: float = 0.002):
+    # How late the event loop wakes a sleeping task: every blocking query shows up here
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - t0 - interval)
+
+
+def _reset_caches():
+    LookupTableCache.invalidate()
+    CalculationResultCache.clear()
+
+
+async def run(args) -> Dict[str, float]:
+    session = SlowSession(args.db_latency_ms / 1000.0)
+    app.dependency_overrides[get_db] = lambda: session
+
+    if args.blocking:
+        async def inline(func, *a, **kw):
+            return func(*a, **kw)
+        lookup_cache.run_in_db_pool = inline
+
+    requests = calculation_requests(args.samples) * args.concurrency
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Serial reference: each request on cold caches, one after another
+        serial = 0.0
+        for path, body in requests:
+            _reset_caches()
+            serial += await _timed_post(client, path, body)
+
+        walls, lags = [], []
+        for _ in range(args.rounds):
+            _reset_caches()
+            stop = asyncio.Event()
+            monitor = asyncio.create_task(_monitor_loop(stop, lags))
+            await asyncio.sleep(0)
+            t0 = time.perf_counter()
+            await asyncio.gather(*(_timed_post(client, path, body) for path, body in requests))
+            walls.append(time.perf_counter() - t0)
+            stop.set()
+            await monitor
+
+    return {
+        "requests": len(requests),
+        "serial_ms": serial * 1000,
+        "concurrent_ms": statistics.median(walls) * 1000,
+        "max_loop_stall_ms": max(lags) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent /calculations load test")
+    parser.add_argument("--concurrency", type=int, default=4, help="Copies of each request per round")
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--db-latency-ms", type=float, default=25.0)
+    parser.add_argument("--blocking", action="store_true", help="Run DB work on the event loop (old behaviour)")
+    args = parser.parse_args()
+
+    r = asyncio.run(run(args))
+    mode = "blocking (event loop)" if args.blocking else "DB thread pool"
+    print(f"mode: {mode}, {r['requests']} requests/round, {args.db_latency_ms} ms per query")
+    print(f"serial cold total      {r['serial_ms']:8.1f} ms")
+    print(f"concurrent round       {r['concurrent_ms']:8.1f} ms  ({r['serial_ms'] / r['concurrent_ms']:.1f}x)")
+    print(f"max event-loop stall   {r['max_loop_stall_ms']:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
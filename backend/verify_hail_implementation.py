@@ -1,5 +1,5 @@
 import asyncio
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock
 from app.services.calculations import CalculationService
 
 async def test_hail_calculation():
@@ -28,9 +28,6 @@ async def test_hail_calculation():
     # We need to patch the static method. Since it's an async static method on the class...
     # Let's just monkeypatch it on the class for this test.
     original_get_lookup = CalculationService.get_lookup_value
-    original_seed_17 = CalculationService.seed_exhibit_17
-    original_seed_23 = CalculationService.seed_exhibit_23
-    original_seed_24 = CalculationService.seed_exhibit_24
 
     async def mock_lookup(db, table_name, input_val, stage=None):
         if "hailStandReduction" in table_name:
@@ -43,9 +40,6 @@ async def test_hail_calculation():
         return 0.0
 
     CalculationService.get_lookup_value = mock_lookup
-    CalculationService.seed_exhibit_17 = AsyncMock()
-    CalculationService.seed_exhibit_23 = AsyncMock()
-    CalculationService.seed_exhibit_24 = AsyncMock()
     
     try:
         result = await CalculationService.calculate_hail_damage(
@@ -88,9 +82,6 @@ async def test_hail_calculation():
     finally:
         # Restore
         CalculationService.get_lookup_value = original_get_lookup
-        CalculationService.seed_exhibit_17 = original_seed_17
-        CalculationService.seed_exhibit_23 = original_seed_23
-        CalculationService.seed_exhibit_24 = original_seed_24
 
 if __name__ == "__main__":
     asyncio.run(test_hail_calculation())
@@ -31,8 +31,6 @@ async def test_metric():
     db = MagicMock()
     # Mock lookup returning 1.0 for factors
     CalculationService.get_lookup_value = MagicMock(return_value=1.0)
-    # Mock seeding method to not fail
-    CalculationService.seed_exhibit_21 = MagicMock()
 
     # We need to instantiate class or just use static? It's static.
     # But get_lookup_value is async.
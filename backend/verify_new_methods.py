@@ -1,5 +1,5 @@
 import asyncio
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock
 from app.services.calculations import CalculationService
 
 async def test_new_methods():
@@ -42,7 +42,6 @@ async def test_new_methods():
     
     # Mock Exhibit 21
     original_get = CalculationService.get_lookup_value
-    CalculationService.seed_exhibit_21 = AsyncMock()
     
     async def mock_lookup(db, table, val, stage):
         if "silage" in table:
@@ -1,5 +1,5 @@
 import asyncio
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock
 from app.services.calculations import CalculationService
 
 async def test_weight_method():
@@ -23,9 +23,6 @@ async def test_weight_method():
     
     # Mock lookup
     original_get_lookup = CalculationService.get_lookup_value
-    original_seed_17 = CalculationService.seed_exhibit_17
-    original_seed_23 = CalculationService.seed_exhibit_23
-    original_seed_24 = CalculationService.seed_exhibit_24
 
     async def mock_lookup(db, table_name, input_val, stage=None):
         if "moistureAdjustment" in table_name:
@@ -39,9 +36,6 @@ async def test_weight_method():
         return 1.0
 
     CalculationService.get_lookup_value = mock_lookup
-    CalculationService.seed_exhibit_17 = AsyncMock()
-    CalculationService.seed_exhibit_23 = AsyncMock()
-    CalculationService.seed_exhibit_24 = AsyncMock()
     
     try:
         # Test Case:
@@ -93,9 +87,6 @@ async def test_weight_method():
         traceback.print_exc()
     finally:
         CalculationService.get_lookup_value = original_get_lookup
-        CalculationService.seed_exhibit_17 = original_seed_17
-        CalculationService.seed_exhibit_23 = original_seed_23
-        CalculationService.seed_exhibit_24 = original_seed_24
 
 if __name__ == "__main__":
     asyncio.run(test_weight_method())
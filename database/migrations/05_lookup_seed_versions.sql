@@ -0,0 +1,7 @@
+-- Create LOOKUP SEED VERSIONS table
+-- One marker row per lookup table seeded at application startup
+CREATE TABLE IF NOT EXISTS lookup_seed_versions (
+    table_name VARCHAR(50) PRIMARY KEY,
+    seed_version INTEGER NOT NULL,
+    seeded_at TIMESTAMPTZ DEFAULT NOW()
+);
@@ -0,0 +1,38 @@
+-- Versioned lookup-table snapshots for offline sync (ETag / delta download).
+-- Builds on lookup_table_versions from schema_clean.sql, which was designed
+-- around lookup_table_definitions. The API stores charts in lookup_tables,
+-- so versions are keyed by lookup_table_name here instead.
+
+CREATE TABLE IF NOT EXISTS lookup_table_versions (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    table_definition_id UUID,
+    version_number VARCHAR(20) NOT NULL,
+    methodology_version_id UUID,
+    effective_date DATE NOT NULL,
+    deprecated_date DATE,
+    change_description TEXT,
+    is_current_version BOOLEAN DEFAULT false,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE lookup_table_versions ALTER COLUMN table_definition_id DROP NOT NULL;
+ALTER TABLE lookup_table_versions ADD COLUMN IF NOT EXISTS lookup_table_name VARCHAR(50);
+ALTER TABLE lookup_table_versions ADD COLUMN IF NOT EXISTS snapshot_version BIGINT;
+
+CREATE INDEX IF NOT EXISTS idx_lookup_versions_snapshot ON lookup_table_versions(snapshot_version);
+CREATE INDEX IF NOT EXISTS idx_lookup_versions_name ON lookup_table_versions(lookup_table_name, is_current_version);
+
+-- One monotonic version across all lookup tables
+CREATE SEQUENCE IF NOT EXISTS lookup_snapshot_version_seq;
+
+-- Version at which each cell last changed (drives since_version deltas)
+ALTER TABLE lookup_tables ADD COLUMN IF NOT EXISTS row_version BIGINT NOT NULL DEFAULT 0;
+CREATE INDEX IF NOT EXISTS idx_lookup_row_version ON lookup_tables(row_version);
+
+-- Baseline: everything already loaded becomes version 1
+SELECT setval('lookup_snapshot_version_seq', GREATEST(1, (SELECT COALESCE(MAX(snapshot_version), 0) FROM lookup_table_versions)));
+UPDATE lookup_tables SET row_version = 1 WHERE row_version = 0;
+INSERT INTO lookup_table_versions (lookup_table_name, snapshot_version, version_number, effective_date, change_description, is_current_version)
+SELECT DISTINCT table_name, 1, '1', CURRENT_DATE, 'Baseline snapshot', true
+FROM lookup_tables
+WHERE NOT EXISTS (SELECT 1 FROM lookup_table_versions WHERE snapshot_version IS NOT NULL);
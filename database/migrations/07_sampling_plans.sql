@@ -0,0 +1,18 @@
+-- Create SAMPLING PLANS table
+-- Issued sampling points, stored once per (field, boundary, method, params, seed)
+CREATE TABLE IF NOT EXISTS sampling_plans (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    field_id UUID NOT NULL REFERENCES fields(id) ON DELETE CASCADE,
+    plan_key VARCHAR(64) NOT NULL UNIQUE,
+    boundary_hash VARCHAR(64) NOT NULL,
+    sampling_method VARCHAR(20) NOT NULL,
+    parameters JSONB NOT NULL,
+    seed BIGINT NOT NULL,
+    sample_points JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_sampling_plans_field ON sampling_plans(field_id);
+
+-- Plan the assessor was issued for a session
+ALTER TABLE assessment_sessions ADD COLUMN IF NOT EXISTS sampling_plan_id UUID REFERENCES sampling_plans(id);
@@ -0,0 +1,10 @@
+-- Simplified field boundaries for map and sync payloads (?detail= / ?zoom=)
+-- Tolerances match BOUNDARY_DETAIL_TOLERANCES in app/services/spatial.py
+ALTER TABLE fields ADD COLUMN IF NOT EXISTS boundary_medium GEOMETRY(POLYGON, 4326);
+ALTER TABLE fields ADD COLUMN IF NOT EXISTS boundary_low GEOMETRY(POLYGON, 4326);
+
+-- Backfill existing fields (~5 m and ~50 m Douglas-Peucker)
+UPDATE fields
+SET boundary_medium = ST_SimplifyPreserveTopology(field_boundary, 0.00005),
+    boundary_low = ST_SimplifyPreserveTopology(field_boundary, 0.0005)
+WHERE boundary_medium IS NULL;
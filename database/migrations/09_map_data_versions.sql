@@ -0,0 +1,80 @@
+-- Create MAP DATA VERSIONS table
+-- Per-tenant counter bumped by any write to fields or claims; vector tiles
+-- are cached under it (app/services/tiles.py), so a bump invalidates them
+CREATE TABLE IF NOT EXISTS map_data_versions (
+    tenant_id UUID PRIMARY KEY REFERENCES tenants(id) ON DELETE CASCADE,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE OR REPLACE FUNCTION bump_map_data_version(p_tenant_id UUID)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO map_data_versions (tenant_id, version) VALUES (p_tenant_id, 1)
+    ON CONFLICT (tenant_id) DO UPDATE
+    SET version = map_data_versions.version + 1, updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+-- Statement-level, so a bulk import bumps each tenant once per statement
+CREATE OR REPLACE FUNCTION fields_map_data_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_map_data_version(t.tenant_id) FROM (
+            SELECT DISTINCT farms.tenant_id FROM new_rows JOIN farms ON farms.id = new_rows.farm_id
+        ) t;
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM bump_map_data_version(t.tenant_id) FROM (
+            SELECT DISTINCT farms.tenant_id
+            FROM (SELECT farm_id FROM new_rows UNION SELECT farm_id FROM old_rows) changed
+            JOIN farms ON farms.id = changed.farm_id
+        ) t;
+    ELSE
+        PERFORM bump_map_data_version(t.tenant_id) FROM (
+            SELECT DISTINCT farms.tenant_id FROM old_rows JOIN farms ON farms.id = old_rows.farm_id
+        ) t;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION claims_map_data_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_map_data_version(t.tenant_id) FROM (SELECT DISTINCT tenant_id FROM new_rows) t;
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM bump_map_data_version(t.tenant_id) FROM (
+            SELECT tenant_id FROM new_rows UNION SELECT tenant_id FROM old_rows
+        ) t;
+    ELSE
+        PERFORM bump_map_data_version(t.tenant_id) FROM (SELECT DISTINCT tenant_id FROM old_rows) t;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables allow one event per trigger
+DROP TRIGGER IF EXISTS fields_map_data_insert ON fields;
+DROP TRIGGER IF EXISTS fields_map_data_update ON fields;
+DROP TRIGGER IF EXISTS fields_map_data_delete ON fields;
+CREATE TRIGGER fields_map_data_insert AFTER INSERT ON fields
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION fields_map_data_changed();
+CREATE TRIGGER fields_map_data_update AFTER UPDATE ON fields
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION fields_map_data_changed();
+CREATE TRIGGER fields_map_data_delete AFTER DELETE ON fields
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION fields_map_data_changed();
+
+DROP TRIGGER IF EXISTS claims_map_data_insert ON claims;
+DROP TRIGGER IF EXISTS claims_map_data_update ON claims;
+DROP TRIGGER IF EXISTS claims_map_data_delete ON claims;
+CREATE TRIGGER claims_map_data_insert AFTER INSERT ON claims
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION claims_map_data_changed();
+CREATE TRIGGER claims_map_data_update AFTER UPDATE ON claims
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION claims_map_data_changed();
+CREATE TRIGGER claims_map_data_delete AFTER DELETE ON claims
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION claims_map_data_changed();
+
+-- Latest claim per field, joined into every field tile
+CREATE INDEX IF NOT EXISTS idx_claims_field ON claims(field_id, created_at DESC);
@@ -0,0 +1,27 @@
+-- Create DEVICE REGISTRATIONS table (as in schema_clean.sql)
+-- Assessor devices and their last reported position, for proximity assignment
+CREATE TABLE IF NOT EXISTS device_registrations (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id),
+    device_id VARCHAR(100) UNIQUE NOT NULL,
+    device_name VARCHAR(100),
+    device_type VARCHAR(30),
+    device_os_version VARCHAR(50),
+    app_version VARCHAR(20),
+    gps_capable BOOLEAN DEFAULT true,
+    camera_capable BOOLEAN DEFAULT true,
+    offline_storage_mb INTEGER,
+    last_location GEOMETRY(POINT, 4326),
+    is_active BOOLEAN DEFAULT true,
+    registration_date TIMESTAMPTZ DEFAULT NOW(),
+    last_seen_at TIMESTAMPTZ DEFAULT NOW(),
+    total_assessments_completed INTEGER DEFAULT 0,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_devices_user ON device_registrations(user_id);
+-- KNN (<->) nearest-assessor lookups
+CREATE INDEX IF NOT EXISTS idx_devices_location ON device_registrations USING GIST (last_location);
+
+-- Open workload per assessor
+CREATE INDEX IF NOT EXISTS idx_claims_assessor_status ON claims(assigned_assessor_id, status);